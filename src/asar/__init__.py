@@ -2,24 +2,58 @@
 
 __version__ = "0.2.0"
 
+import io
 import sys
 import json
-import math
+import mmap
+import stat
 import logging
-from enum import Enum
-from typing import Literal
-from typing import TypeGuard
+import itertools
+import threading
+import contextlib
+from types import TracebackType
+from typing import TYPE_CHECKING
+from typing import Self
+from typing import TypeVar
+from typing import BinaryIO
 from typing import OrderedDict
+from typing import cast
 from typing import overload
 from typing import override
 from pathlib import Path
 from pathlib import PurePath
-from itertools import chain
+from asar.tree import FileTree
+from asar.tree import FolderNode
+from asar.cache import HeaderCache
+from asar.header import Alignment
+from asar.header import AsarHeader
+from asar.header import unpacked_dir_of
+from asar.header import is_file_meta_dict_info
+from asar.header import is_folder_meta_dict_info
+from collections import deque
 from asar.file.base import AsarFile
+from asar.file.base import DiskAsarFile
 from asar.file.base import FileMetaInfo
 from asar.file.base import FileMetaDictInfo
+from asar.file.base import UnpackedAsarFile
+from asar.file.base import FolderMetaDictInfo
+from collections.abc import Mapping
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from asar.integrity.base import IntegrityInfo
+from asar.integrity.base import ChecksumMismatchError
 
 
+# Views returned by dict methods are only named in the private module of typeshed.
+if TYPE_CHECKING:
+    from _collections_abc import dict_keys
+    from _collections_abc import dict_items
+    from _collections_abc import dict_values
+
+_T = TypeVar("_T")
+
 _logger = logging.getLogger(__name__)
 _logger.setLevel(logging.INFO)
 _sh = logging.StreamHandler()
@@ -29,23 +63,13 @@ _sh.setFormatter(_fmt)
 [_logger.removeHandler(handler) for handler in _logger.handlers]
 _logger.addHandler(_sh)
 
+LOAD_AHEAD_SIZE = 64 * 1024 * 1024
+
 
 def _is_debug() -> bool:
     return _logger.level == logging.DEBUG
 
 
-FolderMetaDictInfo = dict[
-    Literal["files"],
-    dict[str, "FileMetaDictInfo | FolderMetaDictInfo"],
-]
-
-
-class Alignment(Enum):
-    """How many bytes are the asar archive is aligned in."""
-
-    DWORD = 4
-
-
 class Asar(dict[PurePath, AsarFile]):
     """An asar archive.
 
@@ -63,49 +87,134 @@ class Asar(dict[PurePath, AsarFile]):
     def __init__(self, *, alignment: Alignment) -> None: ...
 
     @overload
-    def __init__(self, raw: bytes) -> None: ...
+    def __init__(
+        self,
+        raw: bytes | memoryview,
+        *,
+        unpacked_dir: Path | None = None,
+        lazy: bool = False,
+    ) -> None: ...
 
     @overload
-    def __init__(self, raw: bytes, alignment: Alignment) -> None: ...
+    def __init__(
+        self,
+        raw: bytes | memoryview,
+        alignment: Alignment,
+        *,
+        unpacked_dir: Path | None = None,
+        lazy: bool = False,
+    ) -> None: ...
 
     def __init__(
         self,
-        raw: bytes | None = None,
+        raw: bytes | memoryview | None = None,
         alignment: Alignment = Alignment.DWORD,
+        *,
+        unpacked_dir: Path | None = None,
+        lazy: bool = False,
     ):
         """Initialize an Asar archive with arguments given.
 
         Args:
-            raw(bytes): The content of asar archive.
+            raw(bytes | memoryview): The content of asar archive.
+                Content of files are slices of it, so they are memoryviews if it is a memoryview.
             alignment(Alignment): How the archive is aligned.
+            unpacked_dir(Path | None): The `<archive>.unpacked` folder beside archive.
+                Unpacked files are read from it when they are accessed.
+            lazy(bool): If files in a folder are created only when a path under it is accessed.
+                Operations on the whole archive, like iterating or writing, create all of them.
         """
         super().__init__()
         self.alignment = alignment
+        self._unpacked_dir = unpacked_dir
+        self._tree: FileTree[AsarFile] = FileTree()
+        self._mmap: mmap.mmap | None = None
+        self._view: memoryview | None = None
+        self._verified: dict[PurePath, tuple[IntegrityInfo, set[int]]] = {}
+        self._source: tuple[bytes | memoryview, int] | None = None
+        self._pending: dict[PurePath, FolderMetaDictInfo] = {}
+        # Lazy folders may be accessed by many threads, like executors of AsyncAsar.
+        self._materialize_lock = threading.RLock()
+        self._closed = False
         if raw is None:
             _logger.debug("Creating an empty archive.")
         else:
             _logger.debug("Parsing input bytes...")
-            magic_header = raw[: self.alignment.value]
-            if magic_header != self.archive_magic_bytes:
-                raise ValueError("Invalid file magic header.")
-            json_header_size_start = self.alignment.value * 3
-            json_header_size_end = self.alignment.value * 4
-            json_header_size = raw[json_header_size_start:json_header_size_end]
-            json_header_size = int.from_bytes(json_header_size, sys.byteorder)
-            json_header_start = json_header_size_end
-            json_header_end = json_header_start + json_header_size
-            json_header_bytes = raw[json_header_start:json_header_end]
-            if _is_debug():
-                _ = Path("headers.debug.json").write_text(
-                    json.dumps(json_header_bytes, indent=4),
-                    encoding="utf-8",
-                )
-            json_header: FolderMetaDictInfo = json.loads(json_header_bytes)
-            padding = self._get_padding_size(json_header_bytes)
-            self._flattern_json_header_recursively(
-                raw[json_header_end + padding :],
-                json_header,
-            )
+            self._load(raw, AsarHeader.parse(raw, self.alignment), lazy)
+
+    @classmethod
+    def open(
+        cls,
+        path: Path,
+        alignment: Alignment = Alignment.DWORD,
+        *,
+        lazy: bool = False,
+        cache: HeaderCache | None = None,
+    ) -> Self:
+        """Open an asar archive by mapping it into memory.
+
+        Only the json header is parsed, content of files are memoryviews of the map,
+        so they are not read from disk until they are accessed. Unpacked files are read from
+        `<archive>.unpacked` beside archive when they are accessed.
+
+        Args:
+            path(Path): The path to asar archive.
+            alignment(Alignment): How the archive is aligned.
+            lazy(bool): If files in a folder are created only when a path under it is accessed.
+            cache(HeaderCache | None): The cache to load parsed header from.
+
+        Returns:
+            Self: The archive, which should be closed after using.
+        """
+        _logger.debug("Mapping %s into memory...", path)
+        with path.open("rb") as f:
+            header = AsarHeader.read(f, alignment, cache)
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        asar = cls(alignment=alignment)
+        asar._unpacked_dir = unpacked_dir_of(path)
+        asar._load(view, header, lazy)
+        asar._mmap = mapped
+        asar._view = view
+        return asar
+
+    def close(self):
+        """Release the memory map created by Asar.open.
+
+        Content of files backed by the map can not be accessed after closing.
+        Slices of it still alive, like content returned by Asar.read, keep the map valid,
+        it is unmapped when the last of them is released instead.
+        Folders not accessed yet in lazy mode are still listed, but content of their files
+        can not be accessed either.
+        Nothing happens if the archive is not created by Asar.open.
+        """
+        if self._mmap is None or self._view is None:
+            return
+        for f in super().values():
+            if isinstance(f.content, memoryview) and f.content.obj is self._mmap:
+                with contextlib.suppress(BufferError):
+                    f.content.release()
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            _logger.debug("Content of archive is still referenced, it is unmapped later.")
+        self._mmap = None
+        self._view = None
+        self._closed = True
+
+    def __enter__(self) -> Self:
+        """Use archive as a context manager, which closes it when exiting."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ):
+        """Close the archive."""
+        self.close()
 
     @property
     def archive_magic_bytes(self) -> bytes:
@@ -115,63 +224,385 @@ class Asar(dict[PurePath, AsarFile]):
     @property
     def json_header(self) -> FolderMetaDictInfo:
         """Get json header of archive."""
+        self._materialize_all()
         return self._build_json_header_recursively()
 
     @property
     def folders(self) -> list[PurePath]:
-        """Get folders' paths."""
-        folders = chain.from_iterable(f.parents for f in self.files)
-        folders = list(set(folders))
-        if PurePath() in folders:
-            folders.remove(PurePath())
-        return sorted(folders)
+        """Sorted folders' paths."""
+        self._materialize_all()
+        return list(self._tree.folders)
 
     @property
     def files(self) -> list[PurePath]:
-        """Get files' paths."""
-        return sorted(self.keys())
+        """Sorted files' paths."""
+        self._materialize_all()
+        return list(self._tree.files)
+
+    def iter_folders(self) -> Iterator[PurePath]:
+        """Iterate sorted folders' paths without copying them."""
+        self._materialize_all()
+        return iter(self._tree.folders)
+
+    def iter_files(self) -> Iterator[PurePath]:
+        """Iterate sorted files' paths without copying them."""
+        self._materialize_all()
+        return iter(self._tree.files)
+
+    def read(
+        self,
+        path: PurePath,
+        start: int = 0,
+        length: int | None = None,
+        verify: bool = True,
+    ) -> bytes | memoryview:
+        """Read a range of a file, only blocks overlapping the range are verified.
+
+        Verified blocks are remembered until integrity of the file is changed,
+        so reading the same range again hashes nothing. Compressed files are decompressed,
+        the range is in decompressed content and all blocks are verified.
+
+        Args:
+            path(PurePath): The path to the file in archive.
+            start(int): The position to start reading.
+            length(int | None): The max size to read. Read to the end if it is None.
+            verify(bool): If verify blocks overlapping the range.
+                Dirty files are never verified, since their integrity is not generated yet.
+
+        Returns:
+            bytes | memoryview: The content in range.
+
+        Raises:
+            KeyError: If the file does not exist.
+            ChecksumMismatchError: If any block overlapping the range is invalid.
+        """
+        if path.is_absolute():
+            path = path.relative_to("/")
+        file = self[path]
+        if verify and not file.dirty:
+            integrity, verified = self._verified.get(path, (None, set[int]()))
+            if integrity is not file.meta.integrity:
+                verified = set[int]()
+                self._verified[path] = file.meta.integrity, verified
+            checked = start, file.size - start if length is None else length
+            # Blocks of compressed content can not be mapped to a range of decompressed one.
+            if file.meta.codec is not None:
+                checked = 0, file.size
+            if not file.check_range(*checked, verified):
+                raise ChecksumMismatchError("Integrity mismatch.", path)
+        return file.decompress(start, length)
 
     def __bytes__(self) -> bytes:
         """Convert Asar object to valid bytes."""
-        self._sync_meta_info()
-        content = bytes().join(self[f].content for f in self.files)
-        json_header = json.dumps(self.json_header, separators=(",", ":")).encode()
-        json_header_size = len(json_header).to_bytes(
-            self.alignment.value,
-            sys.byteorder,
-        )
-        padding = self._get_padding_size(json_header)
-        padding = bytes(padding)
-        prefix = json_header_size + json_header + padding
-        prefix = self._pickle(prefix)
-        prefix = self._pickle(prefix)
-        header = self.archive_magic_bytes + prefix
-        if (len(header) % self.alignment.value) != 0:
-            raise RuntimeError("Failed to align header part")
-        return header + content
+        return self.to_bytes()
+
+    def to_bytes(self, dedupe: bool = False) -> bytes:
+        """Convert Asar object to valid bytes.
+
+        Args:
+            dedupe(bool): If files with the same content share one region, see write().
+
+        Returns:
+            bytes: The archive.
+        """
+        with io.BytesIO() as buffer:
+            self.write(buffer, dedupe=dedupe)
+            return buffer.getvalue()
+
+    def write(
+        self,
+        fp: BinaryIO,
+        unpacked_dir: Path | None = None,
+        dedupe: bool = False,
+        ordering: Iterable[PurePath] | None = None,
+        jobs: int | None = None,
+        slack: int = 0,
+    ):
+        """Write archive to a binary stream.
+
+        The header is written first, then content of files are written in chunks,
+        so files backed by disk or memory map are never fully loaded into memory.
+        Unpacked files are copied to their folder by a thread pool at the same time.
+
+        Integrity of dirty files is generated while their content is written, and the header
+        is rewritten in place after that. Dirty files up to LOAD_AHEAD_SIZE in total are read
+        and hashed by a thread pool ahead of writing them, larger ones are hashed by the writer.
+        If the stream is not seekable, dirty files are hashed before writing header instead.
+
+        If dedupe is enabled, files with the same size and integrity hash point to the content
+        of the first one. Dirty files have to be hashed before writing header in this mode.
+
+        Content of files is placed in the order of their paths, unless ordering is given.
+        Header is always sorted by paths.
+
+        Args:
+            fp(BinaryIO): The stream to write archive to.
+            unpacked_dir(Path | None): The folder to write unpacked files to, which should be
+                `<archive>.unpacked` beside archive. Unpacked files are not written if it is None.
+            dedupe(bool): If files with the same content share one region.
+            ordering(Iterable[PurePath] | None): Paths of files to place first in this order,
+                the rest of files follow them. Paths which are not files are ignored.
+            jobs(int | None): The count of threads to read and hash dirty files ahead.
+                Count of cpus is used if it is None.
+            slack(int): The size of padding reserved in json header, so files can be
+                updated in place later without moving content, see cli.update.
+
+        Raises:
+            RuntimeError: If size of any file is changed while writing.
+        """
+        self._materialize_all()
+        files = self._sync_meta_info(dedupe, ordering)
+        unpacked = [
+            (path, f) for path, f in zip(self._tree.files, self._tree.values, strict=True)
+            if f.meta.unpacked
+        ]
+        seekable = fp.seekable()
+        dirty = [f for f in files if f.dirty]
+        for _, f in unpacked:
+            if not f.dirty:
+                continue
+            if unpacked_dir is None:
+                f.sync_meta()
+            else:
+                dirty.append(f)
+        sizes = [f.meta.size for f in dirty]
+        for f in dirty:
+            if seekable:
+                f.reserve_integrity()
+            else:
+                f.sync_meta()
+        start = fp.tell() if seekable else 0
+        header = self._build_header()
+        size = None
+        if slack > 0:
+            # Content follows header, so padding is reserved before any content is written.
+            size = len(header) - self.alignment.value * 4 + slack
+            header = self._build_header(size)
+        with ThreadPoolExecutor() as executor:
+            futures = (
+                []
+                if unpacked_dir is None
+                else [
+                    executor.submit(self._write_unpacked, unpacked_dir / path, f)
+                    for path, f in unpacked
+                ]
+            )
+            _ = fp.write(header)
+            self._write_contents(fp, files, jobs)
+            for future in futures:
+                future.result()
+        if [f.meta.size for f in dirty] != sizes:
+            raise RuntimeError("Size of file is changed while writing archive.")
+        if seekable and len(dirty) > 0:
+            end = fp.tell()
+            _ = fp.seek(start)
+            _ = fp.write(self._build_header(size))
+            _ = fp.seek(end)
+
+    @staticmethod
+    def _write_contents(fp: BinaryIO, files: list[AsarFile], jobs: int | None):
+        # Files are written in order as soon as they are loaded, while the pool loads next ones.
+        pending: deque[tuple[AsarFile, Future[bytes | memoryview] | None, int]] = deque()
+        loading = 0
+
+        def _write_first():
+            nonlocal loading
+            f, future, size = pending.popleft()
+            if future is None:
+                f.write(fp)
+                return
+            _ = fp.write(future.result())
+            loading -= size
+
+        with ThreadPoolExecutor(jobs) as executor:
+            for f in files:
+                size = f.size
+                if f.dirty and size <= LOAD_AHEAD_SIZE:
+                    pending.append((f, executor.submit(f.load), size))
+                    loading += size
+                else:
+                    pending.append((f, None, size))
+                while loading > LOAD_AHEAD_SIZE:
+                    _write_first()
+            while len(pending) > 0:
+                _write_first()
+
+    @staticmethod
+    def _write_unpacked(target: Path, f: AsarFile):
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(f, DiskAsarFile) and target.exists() and target.samefile(f.source):
+            f.sync_meta()
+            return
+        with target.open("wb") as out:
+            f.write(out)
+        if f.meta.executable:
+            target.chmod(target.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+    def _build_header(self, size: int | None = None) -> bytes:
+        return AsarHeader(self.json_header, 0).encode(self.alignment, size)
 
     @override
     def __setitem__(self, key: PurePath, value: AsarFile, /) -> None:
         if key.is_absolute():
             key = key.relative_to("/")
+        self._materialize_path(key)
+        self._tree.add(key, value)
+        _ = self._verified.pop(key, None)
         return super().__setitem__(key, value)
 
     @override
     def __getitem__(self, key: PurePath, /) -> AsarFile:
         if key.is_absolute():
             key = key.relative_to("/")
+        self._materialize_path(key)
         return super().__getitem__(key)
 
-    def _get_padding_size(self, data: bytes) -> int:
-        size = len(data)
-        block_count = math.ceil(size / self.alignment.value)
-        aligned_size = block_count * self.alignment.value
-        return aligned_size - size
+    @override
+    def __delitem__(self, key: PurePath, /) -> None:
+        if key.is_absolute():
+            key = key.relative_to("/")
+        self._materialize_path(key)
+        super().__delitem__(key)
+        self._tree.remove(key)
+        _ = self._verified.pop(key, None)
+
+    @override
+    def __contains__(self, key: object, /) -> bool:
+        if isinstance(key, PurePath):
+            if key.is_absolute():
+                key = key.relative_to("/")
+            self._materialize_path(key)
+        return super().__contains__(key)
+
+    @override
+    def get(self, key: PurePath, default: AsarFile | None = None, /) -> AsarFile | None:  # type: ignore
+        if key.is_absolute():
+            key = key.relative_to("/")
+        self._materialize_path(key)
+        return super().get(key, default)
+
+    @override
+    def __iter__(self) -> Iterator[PurePath]:
+        self._materialize_all()
+        return super().__iter__()
+
+    @override
+    def __len__(self) -> int:
+        self._materialize_all()
+        return super().__len__()
+
+    @override
+    def keys(self) -> "dict_keys[PurePath, AsarFile]":
+        self._materialize_all()
+        return super().keys()
+
+    @override
+    def values(self) -> "dict_values[PurePath, AsarFile]":
+        self._materialize_all()
+        return super().values()
+
+    @override
+    def items(self) -> "dict_items[PurePath, AsarFile]":
+        self._materialize_all()
+        return super().items()
+
+    __hash__ = None
+
+    @override
+    def __eq__(self, other: object, /) -> bool:
+        self._materialize_all()
+        if isinstance(other, Asar):
+            other._materialize_all()
+        return super().__eq__(other)
+
+    @override
+    def __ne__(self, other: object, /) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    @override
+    def __repr__(self) -> str:
+        self._materialize_all()
+        return super().__repr__()
+
+    @override
+    def __reversed__(self) -> Iterator[PurePath]:
+        self._materialize_all()
+        return super().__reversed__()
+
+    @override
+    def copy(self) -> dict[PurePath, AsarFile]:
+        self._materialize_all()
+        return super().copy()
+
+    @override
+    def __or__(self, other: dict[PurePath, AsarFile], /) -> dict[PurePath, AsarFile]:  # type: ignore
+        self._materialize_all()
+        return super().__or__(other)
+
+    @override
+    def __ror__(self, other: dict[PurePath, AsarFile], /) -> dict[PurePath, AsarFile]:  # type: ignore
+        self._materialize_all()
+        return super().__ror__(other)
+
+    @override
+    def __ior__(self, other: Mapping[PurePath, AsarFile], /) -> Self:  # type: ignore
+        self.update(other)
+        return self
+
+    @override
+    def update(  # type: ignore
+        self,
+        other: Mapping[PurePath, AsarFile] | Iterable[tuple[PurePath, AsarFile]] = (),
+        /,
+    ) -> None:
+        # Iterables of pairs may be mappings too, whose items are unknown to isinstance.
+        if isinstance(other, Mapping):
+            items = cast(Mapping[PurePath, AsarFile], other).items()
+        else:
+            items = other
+        for key, value in items:
+            self[key] = value
 
-    def _pickle(self, data: bytes) -> bytes:
-        size = len(data)
-        size = size.to_bytes(self.alignment.value, sys.byteorder)
-        return size + data
+    @override
+    def setdefault(self, key: PurePath, default: AsarFile, /) -> AsarFile:  # type: ignore
+        if key.is_absolute():
+            key = key.relative_to("/")
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    @overload
+    def pop(self, key: PurePath, /) -> AsarFile: ...
+
+    @overload
+    def pop(self, key: PurePath, default: AsarFile | _T, /) -> AsarFile | _T: ...
+
+    @override
+    def pop(self, key: PurePath, /, *default: AsarFile | _T) -> AsarFile | _T:
+        if key.is_absolute():
+            key = key.relative_to("/")
+        if key not in self:
+            return super().pop(key, *default)
+        value = super().pop(key)
+        self._tree.remove(key)
+        _ = self._verified.pop(key, None)
+        return value
+
+    @override
+    def popitem(self) -> tuple[PurePath, AsarFile]:
+        self._materialize_all()
+        key, value = super().popitem()
+        self._tree.remove(key)
+        _ = self._verified.pop(key, None)
+        return key, value
+
+    @override
+    def clear(self) -> None:
+        super().clear()
+        self._tree.clear()
+        self._verified.clear()
+        self._pending.clear()
 
     def _unpickle(self, data: bytes) -> tuple[int, bytes]:
         size = data[: self.alignment.value]
@@ -180,69 +611,154 @@ class Asar(dict[PurePath, AsarFile]):
 
     def _flattern_json_header_recursively(
         self,
-        content: bytes,
+        raw: bytes | memoryview,
+        base: int,
         data: FolderMetaDictInfo,
         parent: PurePath | None = None,
+        folder: FolderNode[AsarFile] | None = None,
     ):
-        def _is_folder_meta_dict_info(
-            meta: FileMetaDictInfo | FolderMetaDictInfo,
-        ) -> TypeGuard[FolderMetaDictInfo]:
-            return list(meta.keys()) == ["files"]
-
-        def _is_file_meta_dict_info(
-            meta: FileMetaDictInfo | FolderMetaDictInfo,
-        ) -> TypeGuard[FileMetaDictInfo]:
-            return "files" not in meta
-
+        # Files are attached to tree nodes directly instead of going through __setitem__,
+        # which parses each path again to find its folder.
         if parent is None:
             parent = PurePath()
+        if folder is None:
+            folder = self._tree.root
+        for name, meta in data["files"].items():
+            path = parent / name
+            if is_folder_meta_dict_info(meta):
+                child = FolderNode[AsarFile]()
+                self._flattern_json_header_recursively(raw, base, meta, path, child)
+                if len(child.children) > 0:
+                    folder.children[name] = child
+                continue
+            if not is_file_meta_dict_info(meta):
+                raise NotImplementedError("This meta info is not supported.")
+            file = self._create_file(raw, base, meta, path)
+            folder.children[name] = file
+            super().__setitem__(path, file)
+        self._tree.invalidate()
+
+    def _load(self, raw: bytes | memoryview, header: AsarHeader, lazy: bool):
+        if _is_debug():
+            _ = Path("headers.debug.json").write_text(
+                json.dumps(header.json, indent=4),
+                encoding="utf-8",
+            )
+        if lazy:
+            self._source = raw, header.offset
+            self._pending[PurePath()] = header.json
+        else:
+            self._flattern_json_header_recursively(raw, header.offset, header.json)
+
+    def _create_file(
+        self,
+        raw: bytes | memoryview,
+        base: int,
+        meta: FileMetaDictInfo,
+        path: PurePath,
+    ) -> AsarFile:
+        typed_meta = FileMetaInfo.from_json(meta)
+        offset = typed_meta.offset
+        if offset is None:
+            return UnpackedAsarFile(typed_meta, path, self._unpacked_dir)
+        # Archive is closed, content is the released map like files created before closing.
+        if self._closed:
+            return AsarFile(typed_meta, raw)
+        content_start = base + int(offset)
+        content_end = content_start + typed_meta.size
+        return AsarFile(typed_meta, raw[content_start:content_end])
+
+    def _materialize_folder(self, folder: PurePath):
+        # Only direct files are created, subfolders are left pending. The folder stays pending
+        # until its files are created, so threads seeing no pending folder find all files.
+        data = self._pending.get(folder)
+        if data is None or self._source is None:
+            _ = self._pending.pop(folder, None)
+            return
+        raw, base = self._source
         for name, meta in data["files"].items():
-            if _is_folder_meta_dict_info(meta):
-                self._flattern_json_header_recursively(content, meta, parent / name)
-            elif _is_file_meta_dict_info(meta):
-                typed_meta = FileMetaInfo.from_json(meta)
-                offset = typed_meta.offset
-                if offset is None:
-                    raise RuntimeError("This file is unpacked.")
-                offset = int(offset)
-                content_start = offset
-                content_end = offset + typed_meta.size
-                self[parent / name] = AsarFile(
-                    typed_meta,
-                    content[content_start:content_end],
-                )
+            path = folder / name
+            if is_folder_meta_dict_info(meta):
+                self._pending[path] = meta
+            elif is_file_meta_dict_info(meta):
+                file = self._create_file(raw, base, meta, path)
+                self._tree.add(path, file)
+                super().__setitem__(path, file)
             else:
                 raise NotImplementedError("This meta info is not supported.")
+        del self._pending[folder]
+
+    def _materialize_path(self, path: PurePath):
+        if len(self._pending) == 0:
+            return
+        with self._materialize_lock:
+            for folder in reversed(path.parents):
+                self._materialize_folder(folder)
+            self._materialize_folder(path)
+
+    def _materialize_all(self):
+        if len(self._pending) == 0:
+            return
+        with self._materialize_lock:
+            while len(self._pending) > 0:
+                self._materialize_folder(next(iter(self._pending)))
 
     def _build_json_header_recursively(
         self,
-        parent: PurePath | None = None,
+        folder: FolderNode[AsarFile] | None = None,
     ) -> FolderMetaDictInfo:
-        if parent is None:
-            parent = PurePath()
-
-        def _is_direct_child_of_parent(i: PurePath) -> bool:
-            return i.is_relative_to(parent) and len(i.relative_to(parent).parts) == 1
-
-        filtered = filter(_is_direct_child_of_parent, self.files + self.folders)
-
+        if folder is None:
+            folder = self._tree.root
         header: FolderMetaDictInfo = {"files": OrderedDict()}
-        # TODO
-        for path in sorted(filtered):
-            if path in self.files:
-                meta = self[path].meta
-                header["files"][path.name] = meta.to_json()
+        for name in sorted(folder.children):
+            child = folder.children[name]
+            if isinstance(child, FolderNode):
+                header["files"][name] = self._build_json_header_recursively(child)
             else:
-                header["files"][path.name] = self._build_json_header_recursively(path)
+                header["files"][name] = child.meta.to_json()
         return header
 
-    def _sync_meta_info(self):
+    def _get_layout(self, ordering: Iterable[PurePath] | None) -> list[AsarFile]:
+        if ordering is None:
+            return self._tree.values
+        layout: list[AsarFile] = []
+        # Files are not hashable, so they are identified by id.
+        placed: set[int] = set()
+        ordered = (self.get(path) for path in ordering)
+        for file in itertools.chain(ordered, self._tree.values):
+            if file is not None and id(file) not in placed:
+                placed.add(id(file))
+                layout.append(file)
+        return layout
+
+    def _sync_meta_info(
+        self,
+        dedupe: bool = False,
+        ordering: Iterable[PurePath] | None = None,
+    ) -> list[AsarFile]:
+        # Returns files whose content should be written, in the order of their offsets.
         offset = 0
-        for f in self.files:
-            if self[f].meta.offset is not None:
-                size = len(self[f].content)
-                self[f].meta.offset = str(offset)
-                offset += size
+        files: list[AsarFile] = []
+        offsets: dict[tuple[str, str, int], str] = {}
+        for file in self._get_layout(ordering):
+            if file.meta.offset is None:
+                continue
+            if dedupe:
+                # Content is identified by its hash, which must be known before header is built.
+                file.sync_meta()
+            size = file.size
+            file.meta.size = size
+            if dedupe:
+                integrity = file.meta.integrity
+                key = integrity.algorithm, integrity.hash_, size
+                if key in offsets:
+                    file.meta.offset = offsets[key]
+                    continue
+                offsets[key] = str(offset)
+            file.meta.offset = str(offset)
+            files.append(file)
+            offset += size
+        return files
 
 
 __all__ = ["Alignment", "Asar", "__version__"]
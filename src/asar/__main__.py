@@ -4,9 +4,21 @@ from asar import __version__
 from typing import Literal
 from pathlib import Path
 from pathlib import PurePath
+from argparse import Namespace
 from argparse import ArgumentParser
+from asar.codec import CODECS
+from asar.header import DEFAULT_SLACK
+from asar.cli.diff import diff as _diff
 from asar.cli.list import list_archive as _list
 from asar.cli.pack import pack as _pack
+from asar.cli.bench import SHAPES
+from asar.cli.bench import bench as _bench
+from asar.cli.delta import apply as _apply
+from asar.cli.delta import delta as _delta
+from asar.cli.mount import mount as _mount
+from asar.cli.update import update as _update
+from asar.cli.update import compact as _compact
+from asar.cli.verify import verify as _verify
 from asar.cli.extract import extract as _extract
 from asar.cli.extract import extract_file as _extract_file
 
@@ -20,7 +32,16 @@ _ArgsCommandType = Literal[
     "ef",
     "extract",
     "e",
+    "verify",
+    "bench",
+    "update",
+    "compact",
+    "diff",
+    "delta",
+    "apply",
+    "mount",
 ]
+_CACHE_HELP = "cache parsed header under $XDG_CACHE_HOME/asar"
 
 
 def _create_pack_handler(parser: ArgumentParser) -> ArgumentParser:
@@ -31,9 +52,28 @@ def _create_pack_handler(parser: ArgumentParser) -> ArgumentParser:
         type=Path,
         help="path to a text file for ordering contents",
     )
+    _ = parser.add_argument(
+        "--trace",
+        type=Path,
+        help="path to a trace of files accessed in order, placing them contiguously",
+    )
+    _ = parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="count of threads to stat and hash files, defaults to count of cpus",
+    )
+    _ = parser.add_argument(
+        "--compress",
+        choices=CODECS,
+        help="compress packed files, which can not be read by electron",
+    )
     _ = parser.add_argument(
         "--unpack",
-        help="do not pack files matching glob expression <UNPACK>",
+        help=(
+            "do not pack files matching glob expression <UNPACK>, like minimatch where"
+            " '*' does not cross '/', '**' matches folders and '{a,b}' matches either"
+        ),
     )
     _ = parser.add_argument(
         "--unpack-dir",
@@ -47,6 +87,17 @@ def _create_pack_handler(parser: ArgumentParser) -> ArgumentParser:
         action="store_true",
         help="exclude hidden files",
     )
+    _ = parser.add_argument(
+        "--dedupe",
+        action="store_true",
+        help="store files with the same content only once",
+    )
+    _ = parser.add_argument(
+        "--slack",
+        type=int,
+        default=DEFAULT_SLACK,
+        help="bytes of padding reserved in header, so files can be updated in place",
+    )
     return parser
 
 
@@ -58,23 +109,130 @@ def _create_list_handler(parser: ArgumentParser) -> ArgumentParser:
         action="store_true",
         help="each file in the asar is pack or unpack",
     )
+    _ = parser.add_argument("--size", "-s", action="store_true", help="show size of files")
+    _ = parser.add_argument("--offset", "-o", action="store_true", help="show offset of files")
+    _ = parser.add_argument("--json", action="store_true", help="print each entry as json")
+    _ = parser.add_argument("--cache", action="store_true", help=_CACHE_HELP)
     return parser
 
 
 def _create_extract_file_handler(parser: ArgumentParser) -> ArgumentParser:
     _ = parser.add_argument("archive", type=Path)
     _ = parser.add_argument("filename", type=PurePath)
+    _ = parser.add_argument("--cache", action="store_true", help=_CACHE_HELP)
     return parser
 
 
 def _create_extract_handler(parser: ArgumentParser) -> ArgumentParser:
     _ = parser.add_argument("archive", type=Path)
     _ = parser.add_argument("dest", type=PurePath)
+    _ = parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="count of threads to verify and write files, defaults to count of cpus",
+    )
+    _ = parser.add_argument("--cache", action="store_true", help=_CACHE_HELP)
     return parser
 
 
-def main():
-    """Main entrance of cli."""
+def _create_verify_handler(parser: ArgumentParser) -> ArgumentParser:
+    _ = parser.add_argument("archive", type=Path)
+    _ = parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        help="count of threads to hash files, defaults to count of cpus",
+    )
+    return parser
+
+
+def _create_update_handler(parser: ArgumentParser) -> ArgumentParser:
+    _ = parser.add_argument("archive", type=Path)
+    _ = parser.add_argument("path", type=PurePath)
+    _ = parser.add_argument("file", type=Path)
+    _ = parser.add_argument(
+        "--slack",
+        type=int,
+        default=DEFAULT_SLACK,
+        help="bytes of padding added to header when it has to grow",
+    )
+    return parser
+
+
+def _create_compact_handler(parser: ArgumentParser) -> ArgumentParser:
+    _ = parser.add_argument("archive", type=Path)
+    return parser
+
+
+def _create_diff_handler(parser: ArgumentParser) -> ArgumentParser:
+    _ = parser.add_argument("old", type=Path)
+    _ = parser.add_argument("new", type=Path)
+    _ = parser.add_argument(
+        "--blocks",
+        "-b",
+        action="store_true",
+        help="show indexes of blocks changed in modified files",
+    )
+    _ = parser.add_argument(
+        "--unchanged",
+        "-u",
+        action="store_true",
+        help="show files not changed too",
+    )
+    _ = parser.add_argument("--json", action="store_true", help="print each file as json")
+    return parser
+
+
+def _create_delta_handler(parser: ArgumentParser) -> ArgumentParser:
+    _ = parser.add_argument("old", type=Path)
+    _ = parser.add_argument("new", type=Path)
+    _ = parser.add_argument("--output", "-o", type=Path, required=True, help="path to patch")
+    return parser
+
+
+def _create_apply_handler(parser: ArgumentParser) -> ArgumentParser:
+    _ = parser.add_argument("old", type=Path)
+    _ = parser.add_argument("patch", type=Path)
+    _ = parser.add_argument(
+        "--output",
+        "-o",
+        type=Path,
+        required=True,
+        help="path to new archive",
+    )
+    return parser
+
+
+def _create_mount_handler(parser: ArgumentParser) -> ArgumentParser:
+    _ = parser.add_argument("archive", type=Path)
+    _ = parser.add_argument("mountpoint", type=Path)
+    _ = parser.add_argument(
+        "--background",
+        "-b",
+        action="store_true",
+        help="run in background instead of waiting until it is unmounted",
+    )
+    return parser
+
+
+def _create_bench_handler(parser: ArgumentParser) -> ArgumentParser:
+    _ = parser.add_argument(
+        "--shape",
+        action="append",
+        choices=SHAPES,
+        help="shape of archive to benchmark, can be given multiple times, defaults to all",
+    )
+    _ = parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="factor to scale count or size of files in archives",
+    )
+    return parser
+
+
+def _create_parser() -> ArgumentParser:
     parser = ArgumentParser()
     _ = parser.add_argument(
         "-v",
@@ -95,27 +253,73 @@ def main():
     ef = _create_extract_file_handler(ef)
     e = sparser.add_parser("extract", aliases=["e"], help="extract archive")
     e = _create_extract_handler(e)
-    args = parser.parse_args()
+    v = sparser.add_parser("verify", help="verify integrity of all files in archive")
+    v = _create_verify_handler(v)
+    u = sparser.add_parser("update", help="add or replace a file in archive in place")
+    u = _create_update_handler(u)
+    c = sparser.add_parser("compact", help="remove content not used by any file")
+    c = _create_compact_handler(c)
+    d = sparser.add_parser("diff", help="compare files in two archives by their headers")
+    d = _create_diff_handler(d)
+    dt = sparser.add_parser("delta", help="generate a patch from old archive to new archive")
+    dt = _create_delta_handler(dt)
+    ap = sparser.add_parser("apply", help="build new archive from old archive and a patch")
+    ap = _create_apply_handler(ap)
+    m = sparser.add_parser("mount", help="mount archive as a read-only filesystem with FUSE")
+    m = _create_mount_handler(m)
+    b = sparser.add_parser("bench", help="benchmark operations on synthesized archives")
+    b = _create_bench_handler(b)
+    return parser
+
+
+def _run(args: Namespace):
+    command: _ArgsCommandType = args.command
+    match command:
+        case "pack" | "p":
+            _pack(
+                args.dir,
+                args.output,
+                args.ordering,
+                args.unpack,
+                args.unpack_dir,
+                args.exclude_hidden,
+                args.dedupe,
+                args.trace,
+                args.jobs,
+                args.compress,
+                args.slack,
+            )
+        case "list" | "l":
+            _list(args.archive, args.is_pack, args.size, args.offset, args.json, args.cache)
+        case "extract-file" | "ef":
+            _extract_file(args.archive, args.filename, args.cache)
+        case "extract" | "e":
+            _extract(args.archive, args.dest, args.jobs, args.cache)
+        case "verify":
+            _verify(args.archive, args.jobs)
+        case "bench":
+            _bench(args.shape, args.scale)
+        case "update":
+            _update(args.archive, args.path, args.file, args.slack)
+        case "compact":
+            _compact(args.archive)
+        case "diff":
+            _diff(args.old, args.new, args.blocks, args.unchanged, args.json)
+        case "delta":
+            _delta(args.old, args.new, args.output)
+        case "apply":
+            _apply(args.old, args.patch, args.output)
+        case "mount":
+            _mount(args.archive, args.mountpoint, not args.background)
+
+
+def main():
+    """Main entrance of cli."""
+    args = _create_parser().parse_args()
     if args.version:
         print(__version__)
     else:
-        command: _ArgsCommandType = args.command
-        match command:
-            case "pack" | "p":
-                _pack(
-                    args.dir,
-                    args.output,
-                    args.ordering,
-                    args.unpack,
-                    args.unpack_dir,
-                    args.exclude_hidden,
-                )
-            case "list" | "l":
-                _list(args.archive, args.is_pack)
-            case "extract-file" | "ef":
-                _extract_file(args.archive, args.filename)
-            case "extract" | "e":
-                _extract(args.archive, args.dest)
+        _run(args)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,173 @@
+"""Operate asar archive in asyncio applications without blocking the event loop."""
+
+import asyncio
+import logging
+import functools
+from asar import Asar
+from types import TracebackType
+from typing import Self
+from typing import TypeVar
+from pathlib import Path
+from pathlib import PurePath
+from asar.cache import HeaderCache
+from asar.header import Alignment
+from asar.file.base import AsarFile
+from collections.abc import Callable
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+from asar.integrity.base import ChecksumMismatchError
+
+
+_logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class AsyncAsar:
+    """An archive whose blocking operations run in an executor.
+
+    The executor bounds how many reads and writes run at the same time. It can be shared by
+    many archives, so a slow archive on network storage only occupies its workers.
+    """
+
+    def __init__(self, asar: Asar, executor: Executor | None = None):
+        """Initialize with an opened archive.
+
+        Args:
+            asar(Asar): The archive.
+            executor(Executor | None): The executor to run blocking operations.
+                A thread pool owned by this archive is created if it is None.
+        """
+        self.asar = asar
+        self._own_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor()
+
+    @classmethod
+    async def open(
+        cls,
+        path: Path,
+        alignment: Alignment = Alignment.DWORD,
+        *,
+        lazy: bool = False,
+        cache: HeaderCache | None = None,
+        executor: Executor | None = None,
+    ) -> Self:
+        """Open an asar archive in the executor, see Asar.open.
+
+        Args:
+            path(Path): The path to asar archive.
+            alignment(Alignment): How the archive is aligned.
+            lazy(bool): If files in a folder are created only when a path under it is accessed.
+            cache(HeaderCache | None): The cache to load parsed header from.
+            executor(Executor | None): The executor to run blocking operations.
+                A thread pool owned by this archive is created if it is None.
+
+        Returns:
+            Self: The archive, which should be closed after using.
+        """
+        own_executor = executor or ThreadPoolExecutor()
+        loop = asyncio.get_running_loop()
+        try:
+            asar = await loop.run_in_executor(
+                own_executor,
+                functools.partial(Asar.open, path, alignment, lazy=lazy, cache=cache),
+            )
+        except BaseException:
+            if executor is None:
+                own_executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        archive = cls(asar, own_executor)
+        archive._own_executor = executor is None
+        return archive
+
+    async def close(self):
+        """Close the archive, and shutdown the executor if it is owned by this archive."""
+        await self._run(self.asar.close)
+        if self._own_executor:
+            self.executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> Self:
+        """Use archive as an async context manager, which closes it when exiting."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ):
+        """Close the archive."""
+        await self.close()
+
+    async def read(
+        self,
+        path: PurePath,
+        start: int = 0,
+        length: int | None = None,
+        verify: bool = True,
+    ) -> bytes:
+        """Read a range of a file in the executor, see Asar.read.
+
+        Args:
+            path(PurePath): The path to the file in archive.
+            start(int): The position to start reading.
+            length(int | None): The max size to read. Read to the end if it is None.
+            verify(bool): If verify blocks overlapping the range.
+
+        Returns:
+            bytes: The content in range, which is copied so it is valid after closing.
+
+        Raises:
+            KeyError: If the file does not exist.
+            ChecksumMismatchError: If any block overlapping the range is invalid.
+        """
+
+        def _read() -> bytes:
+            return bytes(self.asar.read(path, start, length, verify))
+
+        return await self._run(_read)
+
+    async def extract(self, dest: Path, verify: bool = True):
+        """Extract archive to the destination, files are verified and written in the executor.
+
+        If the task is cancelled, files not started yet are skipped, while files being
+        written are finished before cancellation is raised.
+
+        Args:
+            dest(Path): The destination to store extracted content.
+            verify(bool): If check integrity of each file before writing it.
+
+        Raises:
+            ChecksumMismatchError: If any file is invalid.
+        """
+        _logger.info("Extracting archive to %s...", dest)
+
+        def _mkdir():
+            dest.mkdir(parents=True, exist_ok=True)
+            # Parents are always created before their children as folders are sorted.
+            for folder in self.asar.iter_folders():
+                (dest / folder).mkdir(exist_ok=True)
+
+        def _write(path: PurePath, f: AsarFile):
+            if verify and not f.check():
+                raise ChecksumMismatchError("Integrity mismatch.", path)
+            f.extract(dest / path)
+
+        await self._run(_mkdir)
+        items = await self._run(lambda: list(self.asar.items()))
+        futures = [self.executor.submit(_write, path, f) for path, f in items]
+        try:
+            _ = await asyncio.gather(*(asyncio.wrap_future(future) for future in futures))
+        except BaseException:
+            for future in futures:
+                _ = future.cancel()
+            # Running writes can not be cancelled, wait for them so no file is written after
+            # extract returns.
+            _ = await asyncio.gather(
+                *(asyncio.wrap_future(future) for future in futures),
+                return_exceptions=True,
+            )
+            raise
+
+    async def _run(self, func: Callable[[], _T]) -> _T:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func)
@@ -8,9 +8,12 @@ from typing import OrderedDict
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class MetaInfo(ABC):
-    """Dataclass to store metainfo from json header."""
+    """Dataclass to store metainfo from json header.
+
+    Subclasses are slotted too, since there is one instance per file in large archives.
+    """
 
     @classmethod
     @abstractmethod
@@ -0,0 +1,133 @@
+"""Cache parsed json headers of archives on disk."""
+
+import os
+import hashlib
+import logging
+import marshal
+import tempfile
+from typing import BinaryIO
+from pathlib import Path
+from asar.file.base import FolderMetaDictInfo
+
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Get the folder to store cache, which follows XDG base directory specification.
+
+    Returns:
+        Path: `$XDG_CACHE_HOME/asar`, or `~/.cache/asar` if the variable is not set.
+    """
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache_home) if xdg_cache_home else Path.home() / ".cache"
+    return base / "asar"
+
+
+class HeaderCache:
+    """Parsed json headers stored in marshal format, so json is not parsed again.
+
+    Entries are keyed by path, size and mtime of the archive and hash of its header,
+    and least recently used entries are removed when total size exceeds the limit.
+    Failing to access the folder is logged and treated as a cache miss.
+    """
+
+    def __init__(self, directory: Path | None = None, max_size: int = DEFAULT_MAX_SIZE):
+        """Initialize cache in the folder.
+
+        Args:
+            directory(Path | None): The folder to store cache. default_cache_dir() if it is None.
+            max_size(int): The max total size of entries in bytes.
+        """
+        self.directory = directory or default_cache_dir()
+        self.max_size = max_size
+
+    @staticmethod
+    def key(fp: BinaryIO, header: bytes) -> str:
+        """Get the key of an archive.
+
+        Args:
+            fp(BinaryIO): The archive opened in binary mode.
+            header(bytes): The json header read from archive.
+
+        Returns:
+            str: The key in hex format.
+        """
+        st = os.fstat(fp.fileno())
+        path = Path(fp.name).resolve() if isinstance(fp.name, str) else fp.name
+        digest = hashlib.sha256(f"{path}\0{st.st_size}\0{st.st_mtime_ns}\0".encode())
+        digest.update(hashlib.sha256(header).digest())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> object | None:
+        """Get the cached json header.
+
+        Args:
+            key(str): The key of archive.
+
+        Returns:
+            object | None: The json header, None if it is not cached.
+        """
+        path = self.directory / key
+        try:
+            # Entries are only written by this class into the folder of current user.
+            data = marshal.loads(path.read_bytes())  # noqa: S302
+            # Mark as recently used for eviction.
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, TypeError):
+            _logger.warning("Failed to read header cache %s.", path, exc_info=True)
+            return None
+        _logger.debug("Header cache hit: %s", key)
+        return data
+
+    def put(self, key: str, json_header: FolderMetaDictInfo):
+        """Store the json header, then remove old entries if cache is too large.
+
+        Args:
+            key(str): The key of archive.
+            json_header(FolderMetaDictInfo): The json header.
+        """
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._write(key, json_header)
+            self._evict()
+        except OSError:
+            _logger.warning("Failed to write header cache %s.", key, exc_info=True)
+
+    def clear(self):
+        """Remove all entries."""
+        for entry in self._entries():
+            Path(entry.path).unlink(missing_ok=True)
+
+    # Entry is written to a temporary file beside it, which is removed if anything fails.
+    def _write(self, key: str, json_header: FolderMetaDictInfo):
+        fd, name = tempfile.mkstemp(dir=self.directory)
+        tmp = Path(name)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump(json_header, f)
+            # Readers never see partial entries.
+            _ = tmp.replace(self.directory / key)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    def _entries(self) -> list[os.DirEntry[str]]:
+        if not self.directory.is_dir():
+            return []
+        with os.scandir(self.directory) as it:
+            return [entry for entry in it if entry.is_file()]
+
+    def _evict(self):
+        entries = [(entry, entry.stat()) for entry in self._entries()]
+        total = sum(st.st_size for _, st in entries)
+        for entry, st in sorted(entries, key=lambda item: item[1].st_mtime_ns):
+            if total <= self.max_size:
+                break
+            _logger.debug("Evicting header cache %s.", entry.name)
+            Path(entry.path).unlink(missing_ok=True)
+            total -= st.st_size
@@ -0,0 +1,149 @@
+"""Benchmark operations on synthesized archives of different shapes."""
+
+import os
+import time
+import tempfile
+import contextlib
+import tracemalloc
+from asar import Asar
+from typing import Literal
+from pathlib import Path
+from dataclasses import dataclass
+from asar.cli.list import list_archive
+from asar.cli.pack import pack
+from collections.abc import Callable
+from asar.cli.extract import extract
+from asar.integrity.verifier import IntegrityVerifier
+
+
+ShapeType = Literal["tiny", "huge", "deep", "wide"]
+SHAPES: list[ShapeType] = ["tiny", "huge", "deep", "wide"]
+_MEGABYTE = 1024 * 1024
+
+
+@dataclass
+class BenchResult:
+    """Dataclass to save result of an operation on an archive."""
+
+    shape: ShapeType
+    operation: str
+    seconds: float
+    size: int
+    entries: int
+    peak: int
+
+    @property
+    def throughput(self) -> float:
+        """Size of archive processed in MB/s."""
+        return self.size / _MEGABYTE / self.seconds if self.seconds > 0 else float("inf")
+
+    @property
+    def entry_rate(self) -> float:
+        """Count of files processed in entries/s."""
+        return self.entries / self.seconds if self.seconds > 0 else float("inf")
+
+
+def _synthesize(root: Path, shape: ShapeType, scale: float):
+    def _write(path: Path, size: int):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as f:
+            for i in range(0, size, _MEGABYTE):
+                _ = f.write(os.urandom(min(_MEGABYTE, size - i)))
+
+    match shape:
+        case "tiny":
+            # node_modules like, lots of small scripts in many folders.
+            for i in range(max(1, int(10000 * scale))):
+                _write(root / f"module{i % 100}" / f"{i}.js", 100)
+        case "huge":
+            for i in range(4):
+                _write(root / f"{i}.bin", max(1, int(64 * _MEGABYTE * scale)))
+        case "deep":
+            for i in range(max(1, int(2000 * scale))):
+                _write(root.joinpath(*["d"] * (i % 50)) / f"{i}.js", 1024)
+        case "wide":
+            for i in range(max(1, int(20000 * scale))):
+                _write(root / f"{i}.js", 1024)
+
+
+def _measure(operation: Callable[[], object]) -> tuple[float, int]:
+    start = time.perf_counter()
+    _ = operation()
+    seconds = time.perf_counter() - start
+    # Tracing slows down allocations, so memory is measured in another run.
+    tracemalloc.start()
+    try:
+        _ = operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak
+
+
+def run_benchmarks(shapes: list[ShapeType], scale: float) -> list[BenchResult]:
+    """Synthesize archives and measure operations on them.
+
+    Args:
+        shapes(list[ShapeType]): The shapes of archives to synthesize.
+        scale(float): The factor to scale count or size of files in archives.
+
+    Returns:
+        list[BenchResult]: Results of each operation on each archive.
+    """
+    results: list[BenchResult] = []
+    for shape in shapes:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            _synthesize(root / "source", shape, scale)
+            archive = root / "bench.asar"
+            pack(root / "source", archive, None, None, None, False)
+            raw = archive.read_bytes()
+            asar = Asar(raw)
+
+            def _list(archive: Path = archive):
+                with (
+                    Path(os.devnull).open("w", encoding="utf-8") as devnull,
+                    contextlib.redirect_stdout(devnull),
+                ):
+                    list_archive(archive, False)
+
+            operations: dict[str, Callable[[], object]] = {
+                "parse": lambda raw=raw: Asar(raw),
+                "serialize": lambda asar=asar: bytes(asar),
+                "list": _list,
+                "extract": lambda archive=archive, dest=root / "dest": extract(archive, dest),
+                "check": lambda asar=asar: all(f.check() for f in asar.values()),
+                "verify": lambda asar=asar: IntegrityVerifier().verify(asar),
+            }
+            for operation, func in operations.items():
+                seconds, peak = _measure(func)
+                results.append(BenchResult(shape, operation, seconds, len(raw), len(asar), peak))
+    return results
+
+
+def bench(shapes: list[ShapeType] | None, scale: float):
+    """Benchmark operations on synthesized archives and print results.
+
+    Args:
+        shapes(list[ShapeType] | None): The shapes of archives. All shapes are used if it is None.
+        scale(float): The factor to scale count or size of files in archives.
+    """
+    headers = [
+        f"{'shape':<6}",
+        f"{'operation':<10}",
+        f"{'seconds':>10}",
+        f"{'MB/s':>10}",
+        f"{'entries/s':>12}",
+        f"{'peak MiB':>10}",
+    ]
+    print("".join(headers))
+    for result in run_benchmarks(shapes or SHAPES, scale):
+        columns = [
+            f"{result.shape:<6}",
+            f"{result.operation:<10}",
+            f"{result.seconds:>10.4f}",
+            f"{result.throughput:>10.1f}",
+            f"{result.entry_rate:>12.0f}",
+            f"{result.peak / _MEGABYTE:>10.2f}",
+        ]
+        print("".join(columns))
@@ -0,0 +1,203 @@
+"""Generate and apply binary patches between two versions of an archive."""
+
+import mmap
+import struct
+import hashlib
+import logging
+from typing import BinaryIO
+from pathlib import Path
+from pathlib import PurePath
+from asar.header import AsarHeader
+from asar.file.base import CHUNK_SIZE
+from asar.file.base import FileMetaInfo
+from asar.integrity.base import ChecksumMismatchError
+
+
+_logger = logging.getLogger(__name__)
+
+# Layout of a patch:
+#   magic, size of new header, sha256 of new archive, new header,
+#   then operations building content of new archive until the end of patch:
+#   copy: _OP_COPY, offset in old archive, length
+#   data: _OP_DATA, length, data
+_MAGIC = b"ASARDLT\x01"
+_PREFIX = struct.Struct("<Q32s")
+_OP_COPY = 0
+_OP_DATA = 1
+_COPY = struct.Struct("<QQ")
+_DATA = struct.Struct("<Q")
+
+
+class _OperationWriter:
+    """Write operations of a patch, adjacent ranges copied from old archive are merged."""
+
+    def __init__(self, fp: BinaryIO):
+        self.fp = fp
+        self._copy: tuple[int, int] | None = None
+
+    def copy(self, offset: int, length: int):
+        if self._copy is not None and sum(self._copy) == offset:
+            self._copy = self._copy[0], self._copy[1] + length
+            return
+        self.flush()
+        self._copy = offset, length
+
+    def data(self, data: memoryview):
+        self.flush()
+        _ = self.fp.write(bytes([_OP_DATA]) + _DATA.pack(len(data)))
+        _ = self.fp.write(data)
+
+    def flush(self):
+        if self._copy is not None:
+            _ = self.fp.write(bytes([_OP_COPY]) + _COPY.pack(*self._copy))
+            self._copy = None
+
+
+def _index(header: AsarHeader) -> dict[PurePath | tuple[str, str, int], FileMetaInfo]:
+    # Packed files by their paths, and by their content for files moved or copied.
+    index: dict[PurePath | tuple[str, str, int], FileMetaInfo] = {}
+    for path, meta in header.walk():
+        if meta is None or meta.unpacked:
+            continue
+        index[path] = meta
+        index.setdefault((meta.integrity.algorithm, meta.integrity.hash_, meta.size), meta)
+    return index
+
+
+def _write_file(
+    ops: _OperationWriter,
+    view: memoryview,
+    meta: FileMetaInfo,
+    old: FileMetaInfo | None,
+    old_base: int,
+):
+    integrity = meta.integrity
+    if old is None:
+        ops.data(view)
+        return
+    old_start = old_base + int(old.offset or 0)
+    if (old.integrity.algorithm, old.integrity.hash_, old.size) == (
+        integrity.algorithm,
+        integrity.hash_,
+        meta.size,
+    ):
+        ops.copy(old_start, meta.size)
+        return
+    if (old.integrity.algorithm, old.integrity.blocksize) != (
+        integrity.algorithm,
+        integrity.blocksize,
+    ):
+        ops.data(view)
+        return
+    for i, start in enumerate(range(0, meta.size, integrity.blocksize)):
+        block = view[start : start + integrity.blocksize]
+        if (
+            old.integrity.blocks[i : i + 1] == integrity.blocks[i : i + 1]
+            and start + len(block) <= old.size
+        ):
+            ops.copy(old_start + start, len(block))
+        else:
+            ops.data(block)
+
+
+def delta(old: Path, new: Path, output: Path):
+    """Generate a patch which builds the new archive from the old one.
+
+    Files are compared by integrity in headers. Files whose content exists in the old archive
+    and blocks not changed in modified files are copied from the old archive, so only
+    content changed is stored in the patch.
+
+    Args:
+        old(Path): The path to the old archive.
+        new(Path): The path to the new archive.
+        output(Path): The path to generated patch.
+    """
+    _logger.info("Generating patch from %s to %s...", old, new)
+    with old.open("rb") as old_fp, new.open("rb") as new_fp, output.open("wb") as out:
+        old_header = AsarHeader.read(old_fp)
+        old_index = _index(old_header)
+        new_header = AsarHeader.read(new_fp)
+        base = new_header.offset
+        layout = sorted(
+            (int(meta.offset), path, meta)
+            for path, meta in new_header.walk()
+            if meta is not None and meta.offset is not None
+        )
+        with (
+            mmap.mmap(new_fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+            memoryview(mapped) as view,
+        ):
+            _ = out.write(_MAGIC + _PREFIX.pack(base, hashlib.sha256(view).digest()))
+            _ = out.write(view[:base])
+            ops = _OperationWriter(out)
+            position = base
+            for offset, path, meta in layout:
+                start, end = base + offset, base + offset + meta.size
+                # Content shared by deduplicated files is written only once.
+                if end <= position:
+                    continue
+                if start < position:
+                    ops.data(view[position:end])
+                    position = end
+                    continue
+                # Content not used by any file is kept as is.
+                if start > position:
+                    ops.data(view[position:start])
+                key = meta.integrity.algorithm, meta.integrity.hash_, meta.size
+                old_meta = old_index.get(key) or old_index.get(path)
+                _write_file(ops, view[start:end], meta, old_meta, old_header.offset)
+                position = end
+            if position < len(view):
+                ops.data(view[position:])
+            ops.flush()
+
+
+def apply(old: Path, patch: Path, output: Path):
+    """Build the new archive from the old one and a patch generated by delta().
+
+    Args:
+        old(Path): The path to the old archive.
+        patch(Path): The path to the patch.
+        output(Path): The path to the new archive.
+
+    Raises:
+        ValueError: If the patch is invalid.
+        ChecksumMismatchError: If the archive built does not match the patch,
+            which means the old archive is not the one used to generate the patch.
+    """
+    _logger.info("Applying %s to %s...", patch, old)
+    digest = hashlib.sha256()
+    with old.open("rb") as old_fp, patch.open("rb") as patch_fp, output.open("wb") as out:
+
+        def _write(data: bytes | memoryview):
+            digest.update(data)
+            _ = out.write(data)
+
+        if patch_fp.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError("Invalid patch magic header.")
+        header_size, expected = _PREFIX.unpack(patch_fp.read(_PREFIX.size))
+        _write(patch_fp.read(header_size))
+        with (
+            mmap.mmap(old_fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+            memoryview(mapped) as view,
+        ):
+            while op := patch_fp.read(1):
+                match op[0]:
+                    case 0:  # _OP_COPY
+                        offset, length = _COPY.unpack(patch_fp.read(_COPY.size))
+                        if offset + length > len(view):
+                            raise ValueError("Copying out of old archive.", offset, length)
+                        _write(view[offset : offset + length])
+                    case 1:  # _OP_DATA
+                        (length,) = _DATA.unpack(patch_fp.read(_DATA.size))
+                        while length > 0:
+                            chunk = patch_fp.read(min(length, CHUNK_SIZE))
+                            if len(chunk) == 0:
+                                raise ValueError("Patch is truncated.")
+                            _write(chunk)
+                            length -= len(chunk)
+                    case _:
+                        raise ValueError("Invalid patch operation.", op[0])
+    if digest.digest() != expected:
+        output.unlink()
+        raise ChecksumMismatchError("Archive built does not match the patch.")
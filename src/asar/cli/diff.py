@@ -0,0 +1,111 @@
+"""Compare two archives by their headers only."""
+
+import json
+from typing import Literal
+from pathlib import Path
+from pathlib import PurePath
+from asar.header import AsarHeader
+from dataclasses import field
+from dataclasses import dataclass
+from asar.file.base import FileMetaInfo
+
+
+DiffStatusType = Literal["added", "removed", "modified", "unchanged"]
+_STATUS_MARKS: dict[DiffStatusType, str] = {
+    "added": "A",
+    "removed": "D",
+    "modified": "M",
+    "unchanged": " ",
+}
+
+
+@dataclass
+class FileDiff:
+    """Dataclass to describe how a file is changed between two archives."""
+
+    path: PurePath
+    status: DiffStatusType
+    blocks: list[int] = field(default_factory=list[int])
+
+
+def _changed_blocks(old: FileMetaInfo, new: FileMetaInfo) -> list[int]:
+    old_integrity, new_integrity = old.integrity, new.integrity
+    if (old_integrity.algorithm, old_integrity.blocksize) != (
+        new_integrity.algorithm,
+        new_integrity.blocksize,
+    ):
+        return list(range(len(new_integrity.blocks)))
+    return [
+        i
+        for i in range(max(len(old_integrity.blocks), len(new_integrity.blocks)))
+        if old_integrity.blocks[i : i + 1] != new_integrity.blocks[i : i + 1]
+    ]
+
+
+def diff_headers(old: AsarHeader, new: AsarHeader) -> list[FileDiff]:
+    """Compare files in two headers by their size and integrity, content is never read.
+
+    Args:
+        old(AsarHeader): The header of the old archive.
+        new(AsarHeader): The header of the new archive.
+
+    Returns:
+        list[FileDiff]: Changes of all files in both archives, sorted by paths.
+            Indexes of blocks changed are given for modified files.
+    """
+    old_files = {path: meta for path, meta in old.walk() if meta is not None}
+    new_files = {path: meta for path, meta in new.walk() if meta is not None}
+    diffs: list[FileDiff] = []
+    for path in sorted(old_files.keys() | new_files.keys()):
+        old_meta, new_meta = old_files.get(path), new_files.get(path)
+        if old_meta is None:
+            diffs.append(FileDiff(path, "added"))
+        elif new_meta is None:
+            diffs.append(FileDiff(path, "removed"))
+        elif (old_meta.size, old_meta.integrity.algorithm, old_meta.integrity.hash_) != (
+            new_meta.size,
+            new_meta.integrity.algorithm,
+            new_meta.integrity.hash_,
+        ):
+            diffs.append(FileDiff(path, "modified", _changed_blocks(old_meta, new_meta)))
+        else:
+            diffs.append(FileDiff(path, "unchanged"))
+    return diffs
+
+
+def diff(
+    old: Path,
+    new: Path,
+    blocks: bool = False,
+    unchanged: bool = False,
+    json_: bool = False,
+):
+    """Print files changed between two archives, only headers are read.
+
+    Args:
+        old(Path): The path to the old archive.
+        new(Path): The path to the new archive.
+        blocks(bool): If show indexes of blocks changed in modified files.
+        unchanged(bool): If show files not changed too.
+        json_(bool): If print each file as a line of json.
+    """
+    with old.open("rb") as f:
+        old_header = AsarHeader.read(f)
+    with new.open("rb") as f:
+        new_header = AsarHeader.read(f)
+    for file_diff in diff_headers(old_header, new_header):
+        if file_diff.status == "unchanged" and not unchanged:
+            continue
+        if json_:
+            entry: dict[str, str | list[int]] = {
+                "path": str("/" / file_diff.path),
+                "status": file_diff.status,
+            }
+            if blocks and file_diff.status == "modified":
+                entry["blocks"] = file_diff.blocks
+            print(json.dumps(entry))
+            continue
+        columns = [_STATUS_MARKS[file_diff.status], str("/" / file_diff.path)]
+        if blocks and file_diff.status == "modified":
+            columns.append(f"blocks: {', '.join(map(str, file_diff.blocks))}")
+        print(*columns)
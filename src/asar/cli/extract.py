@@ -1,53 +1,83 @@
 """Extract whole archive or some files inside it."""
 
-import stat
 import logging
 from asar import Asar
 from pathlib import Path
 from pathlib import PurePath
+from asar.cache import HeaderCache
+from asar.header import AsarHeader
+from asar.header import unpacked_dir_of
+from asar.file.base import AsarFile
+from concurrent.futures import ThreadPoolExecutor
+from asar.integrity.base import ChecksumMismatchError
+from asar.integrity.verifier import IntegrityVerifier
 
 
 _logger = logging.getLogger(__name__)
 
 
-class ChecksumMismatchError(Exception):
-    """Raises when a FileMetaInfo failed to check integrity."""
-
-
-def extract_file(archive: Path, filename: PurePath):
+def extract_file(archive: Path, filename: PurePath, cache: bool = False):
     """Extract a file in the archive.
 
+    Only the header and content of the file are read from the archive.
+    Unpacked files are read from `<archive>.unpacked` beside archive.
+    Compressed files are decompressed after checking integrity.
+
     Args:
         archive(Path): The path to asar archive.
         filename(PurePath): The path to the file to extract.
+        cache(bool): If load parsed header from the header cache.
+
+    Raises:
+        ChecksumMismatchError: If content of the file does not match its integrity.
     """
     _logger.info("Extracting file %s to %s...", filename, filename.name)
-    filename = filename.relative_to("/")
-    asar = Asar(archive.read_bytes())
-    if filename.is_absolute():
-        filename = filename.relative_to("/")
-    target = asar[filename]
+    with archive.open("rb") as f:
+        header = AsarHeader.read(f, cache=HeaderCache() if cache else None)
+        meta = header.get(filename)
+        if meta.unpacked:
+            path = unpacked_dir_of(archive) / filename.relative_to(filename.anchor)
+            content = path.read_bytes()
+        else:
+            content = header.read_content(f, meta)
+        target = AsarFile(meta, content)
     if not target.check():
-        raise ChecksumMismatchError
-    _ = Path(filename.name).write_bytes(target.content)
+        raise ChecksumMismatchError("Integrity mismatch.", filename)
+    target.extract(Path(filename.name))
 
 
-def extract(archive: Path, dest: PurePath):
+def extract(archive: Path, dest: PurePath, jobs: int | None = None, cache: bool = False):
     """Extract archive to the destination.
 
+    All folders are created before writing files, then files are written by a thread pool.
+    Content is written from the memory map of archive, so it is never copied into python.
+    Compressed files are decompressed in chunks while writing.
+
     Args:
         archive(Path): The path to asar archive.
         dest(PurePath): The destination to store extracted content.
+        jobs(int | None): The count of threads to verify and write files.
+            Count of cpus is used if it is None.
+        cache(bool): If load parsed header from the header cache.
+
+    Raises:
+        ChecksumMismatchError: If any file does not match its integrity.
     """
     if not dest.is_absolute():
         dest = PurePath(Path.cwd() / dest)
     _logger.info("Extracting archive to %s...", dest)
-    asar = Asar(archive.read_bytes())
-    for path, f in asar.items():
-        target_path = Path(dest / path)
-        target_path.parent.mkdir(parents=True, exist_ok=True)
-        if not f.check():
-            raise ChecksumMismatchError
-        _ = target_path.write_bytes(f.content)
-        if f.meta.executable:
-            target_path.chmod(stat.S_IXOTH | stat.S_IXGRP | stat.S_IXUSR)
+
+    def _write(item: tuple[PurePath, AsarFile]):
+        path, f = item
+        f.extract(Path(dest / path))
+
+    with Asar.open(archive, cache=HeaderCache() if cache else None) as asar:
+        if len(IntegrityVerifier(jobs).verify(asar)) > 0:
+            raise ChecksumMismatchError("Integrity mismatch.", archive)
+        Path(dest).mkdir(parents=True, exist_ok=True)
+        # Parents are always created before their children as folders are sorted.
+        for folder in asar.iter_folders():
+            Path(dest / folder).mkdir(exist_ok=True)
+        with ThreadPoolExecutor(jobs) as executor:
+            for _ in executor.map(_write, asar.items()):
+                pass
@@ -1,20 +1,51 @@
 """List content in the archive."""
 
-from asar import Asar
+import json
 from pathlib import Path
+from asar.cache import HeaderCache
+from asar.header import AsarHeader
 
 
-def list_archive(archive: Path, is_pack: bool):
+def list_archive(
+    archive: Path,
+    is_pack: bool,
+    size: bool = False,
+    offset: bool = False,
+    json_: bool = False,
+    cache: bool = False,
+):
     """List content in the archive.
 
+    Only the json header is read, and entries are printed while walking it.
+
     Args:
         archive(Path): The path to the asar archive.
         is_pack(bool): If mark the file is packed in archive.
+        size(bool): If show size of files.
+        offset(bool): If show offset of files.
+        json_(bool): If print each entry as a line of json, which includes all columns.
+        cache(bool): If load parsed header from the header cache.
     """
-    asar = Asar(archive.read_bytes())
-    for path in sorted(asar.files + asar.folders):
-        if path in asar and asar[path].meta.offset is None:
-            head = "    :" if is_pack else ""
-        else:
-            head = "packed    :" if is_pack else ""
-        print(head, "/" / path)
+    with archive.open("rb") as f:
+        header = AsarHeader.read(f, cache=HeaderCache() if cache else None)
+    for path, meta in header.walk():
+        if json_:
+            entry: dict[str, str | int | bool | None] = {"path": str("/" / path)}
+            if meta is None:
+                entry["type"] = "folder"
+            else:
+                entry["type"] = "file"
+                entry["size"] = meta.size
+                entry["offset"] = meta.offset
+                entry["unpacked"] = meta.unpacked
+                entry["executable"] = meta.executable
+            print(json.dumps(entry))
+            continue
+        columns: list[str] = []
+        if is_pack:
+            columns.append("    :" if meta is not None and meta.unpacked else "packed    :")
+        if size:
+            columns.append("-" if meta is None else str(meta.size))
+        if offset:
+            columns.append("-" if meta is None or meta.offset is None else meta.offset)
+        print(*columns, "/" / path)
@@ -0,0 +1,278 @@
+"""Mount an archive as a read-only filesystem with FUSE."""
+
+import os
+import stat
+import errno
+import logging
+import importlib
+import threading
+from asar.fs import ContentCache
+from pathlib import Path
+from pathlib import PurePath
+from asar.codec import CodecType
+from asar.codec import decompress
+from asar.header import AsarHeader
+from asar.header import unpacked_dir_of
+from collections import OrderedDict
+from asar.file.base import CHUNK_SIZE
+from asar.file.base import FileMetaInfo
+from collections.abc import Iterator
+
+
+# fusepy is optional and untyped, so it is loaded as a module whose members are Any.
+try:
+    fuse = importlib.import_module("fuse")
+except ImportError:
+    fuse = None
+
+_logger = logging.getLogger(__name__)
+
+_ROOT = PurePath("/")
+MAX_STREAMS = 8
+
+
+# FUSE binding returns errno of OSError to the kernel.
+def _error(code: int, path: str) -> OSError:
+    return OSError(code, os.strerror(code), path)
+
+
+class MountHandler:
+    """FUSE operations serving an archive from its header and positional reads into it.
+
+    Nothing is extracted, the kernel page cache keeps content read recently. As the kernel reads
+    files in small ranges, compressed files are kept decompressed in a content cache, while
+    up to MAX_STREAMS files larger than the cache are streamed, so reading them forward never
+    decompresses from the start again.
+    Content is not verified, use verify command to check integrity of files.
+    """
+
+    def __init__(self, archive: Path, cache: ContentCache | None = None):
+        """Open the archive and index its header.
+
+        Args:
+            archive(Path): The path to asar archive.
+            cache(ContentCache | None): The cache to keep decompressed files.
+                A cache owned by this handler is created if it is None.
+        """
+        self.archive = archive
+        self.unpacked_dir = unpacked_dir_of(archive)
+        with archive.open("rb") as f:
+            self.header = AsarHeader.read(f)
+            st = os.fstat(f.fileno())
+            self.fd = os.dup(f.fileno())
+        # Files and folders share times of the archive.
+        self._times = {"st_atime": st.st_atime, "st_mtime": st.st_mtime, "st_ctime": st.st_ctime}
+        self._ids = {"st_uid": st.st_uid, "st_gid": st.st_gid}
+        self._files: dict[str, FileMetaInfo] = {}
+        self.cache = cache if cache is not None else ContentCache()
+        self._streams: OrderedDict[str, _DecompressedStream] = OrderedDict()
+        self._lock = threading.Lock()
+        self._folders: dict[str, list[str]] = {"/": []}
+        for path, meta in self.header.walk():
+            key = (_ROOT / path).as_posix()
+            self._folders[(_ROOT / path.parent).as_posix()].append(path.name)
+            if meta is None:
+                self._folders[key] = []
+            else:
+                self._files[key] = meta
+
+    def __call__(self, op: str, *args: object) -> object:
+        """Dispatch an operation from FUSE binding.
+
+        Raises:
+            OSError: With errno set, which is returned to the kernel.
+        """
+        handler = getattr(self, op, None)
+        if op.startswith("_") or handler is None:
+            raise _error(errno.ENOSYS, op)
+        return handler(*args)
+
+    def getattr(self, path: str, fh: int | None = None) -> dict[str, int | float]:
+        """Get status of a file or folder, files are executable if they are marked so.
+
+        Args:
+            path(str): The absolute path in archive.
+            fh(int | None): Not used.
+
+        Returns:
+            dict[str, int | float]: The status in the form of os.stat_result.
+
+        Raises:
+            OSError: If the path does not exist.
+        """
+        attrs: dict[str, int | float] = {**self._times, **self._ids}
+        if path in self._folders:
+            attrs["st_mode"] = stat.S_IFDIR | 0o555
+            attrs["st_nlink"] = 2
+            attrs["st_size"] = 0
+            return attrs
+        meta = self._get_file(path)
+        mode = 0o555 if meta.executable else 0o444
+        attrs["st_mode"] = stat.S_IFREG | mode
+        attrs["st_nlink"] = 1
+        attrs["st_size"] = meta.content_size
+        return attrs
+
+    def readdir(self, path: str, fh: int | None = None) -> list[str]:
+        """List names in a folder.
+
+        Args:
+            path(str): The absolute path to the folder in archive.
+            fh(int | None): Not used.
+
+        Returns:
+            list[str]: The names with `.` and `..`.
+
+        Raises:
+            OSError: If the path is not a folder.
+        """
+        names = self._folders.get(path)
+        if names is None:
+            raise _error(errno.ENOTDIR if path in self._files else errno.ENOENT, path)
+        return [".", "..", *names]
+
+    def open(self, path: str, flags: int) -> int:
+        """Check a file can be opened, it is only allowed to read.
+
+        Args:
+            path(str): The absolute path to the file in archive.
+            flags(int): The flags of open.
+
+        Returns:
+            int: 0 as file handles are not used.
+
+        Raises:
+            OSError: If the file does not exist or it is opened for writing.
+        """
+        _ = self._get_file(path)
+        if flags & os.O_ACCMODE != os.O_RDONLY:
+            raise _error(errno.EROFS, path)
+        return 0
+
+    def read(self, path: str, size: int, offset: int, fh: int | None = None) -> bytes:
+        """Read a range of a file by positional read into the archive.
+
+        Args:
+            path(str): The absolute path to the file in archive.
+            size(int): The max size to read.
+            offset(int): The position in the file to start reading.
+            fh(int | None): Not used.
+
+        Returns:
+            bytes: The content in range.
+
+        Raises:
+            OSError: If the file does not exist, or it can not be decompressed.
+        """
+        meta = self._get_file(path)
+        if meta.codec is not None:
+            try:
+                return self._read_decompressed(path, meta, meta.codec, size, offset)
+            except ValueError as e:
+                _logger.error("Failed to decompress %s: %s", path, e)
+                raise _error(errno.EIO, path) from e
+        size = max(0, min(size, meta.size - offset))
+        if meta.offset is None:
+            fd = os.open(self.unpacked_dir / path.lstrip("/"), os.O_RDONLY)
+            try:
+                return os.pread(fd, size, offset)
+            finally:
+                os.close(fd)
+        return os.pread(self.fd, size, self.header.offset + int(meta.offset) + offset)
+
+    def destroy(self, path: str):
+        """Close the archive when filesystem is unmounted.
+
+        Args:
+            path(str): Not used.
+        """
+        os.close(self.fd)
+
+    def _read_decompressed(
+        self,
+        path: str,
+        meta: FileMetaInfo,
+        codec: CodecType,
+        size: int,
+        offset: int,
+    ) -> bytes:
+        # Compressed files are always packed, they are decompressed once if they fit the cache.
+        key = self, PurePath(path)
+        content = self.cache.get(key)
+        if content is None and meta.content_size <= self.cache.max_size:
+            content = b"".join(self._iter_decompressed(meta, codec))
+            self.cache.put(key, content)
+        if content is not None:
+            return content[offset : offset + size]
+        # Streams of files read recently are kept, so reading them alternately stays linear.
+        with self._lock:
+            stream = self._streams.pop(path, None)
+            if stream is None or offset < stream.position:
+                stream = _DecompressedStream(self._iter_decompressed(meta, codec))
+            self._streams[path] = stream
+            while len(self._streams) > MAX_STREAMS:
+                _ = self._streams.popitem(last=False)
+            return stream.read(size, offset)
+
+    def _iter_decompressed(self, meta: FileMetaInfo, codec: CodecType) -> Iterator[bytes]:
+        start = self.header.offset + int(meta.offset or 0)
+        chunks = (
+            os.pread(self.fd, min(CHUNK_SIZE, meta.size - i), start + i)
+            for i in range(0, meta.size, CHUNK_SIZE)
+        )
+        return decompress(chunks, codec, meta.content_size)
+
+    def _get_file(self, path: str) -> FileMetaInfo:
+        meta = self._files.get(path)
+        if meta is None:
+            raise _error(errno.EISDIR if path in self._folders else errno.ENOENT, path)
+        return meta
+
+
+class _DecompressedStream:
+    # Decompressed content of a file read forward, only the last chunk of it is kept.
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self.position = 0
+        self._chunk = b""
+        self._chunks = chunks
+
+    def read(self, size: int, offset: int) -> bytes:
+        parts: list[bytes] = []
+        while size > 0:
+            end = self.position + len(self._chunk)
+            if offset < end:
+                part = self._chunk[offset - self.position : offset - self.position + size]
+                parts.append(part)
+                offset += len(part)
+                size -= len(part)
+                continue
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self.position = end
+            self._chunk = chunk
+        return b"".join(parts)
+
+
+def mount(archive: Path, mountpoint: Path, foreground: bool):
+    """Mount an archive at the mountpoint as a read-only filesystem.
+
+    Args:
+        archive(Path): The path to asar archive.
+        mountpoint(Path): The folder to mount at.
+        foreground(bool): If stay in foreground until it is unmounted.
+
+    Raises:
+        RuntimeError: If fusepy is not installed.
+    """
+    if fuse is None:
+        raise RuntimeError("fusepy is required to mount archives, install asar[fuse].")
+    _logger.info("Mounting %s at %s...", archive, mountpoint)
+    _ = fuse.FUSE(
+        MountHandler(archive),
+        str(mountpoint),
+        foreground=foreground,
+        ro=True,
+        fsname=archive.name,
+    )
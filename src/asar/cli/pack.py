@@ -1,6 +1,29 @@
 """Pack a folder into the archive."""
 
+import os
+import re
+import logging
+import tempfile
+import functools
+import contextlib
+from asar import Asar
 from pathlib import Path
+from pathlib import PurePath
+from asar.codec import CodecType
+from asar.codec import compress
+from asar.header import DEFAULT_SLACK
+from asar.header import unpacked_dir_of
+from asar.ordering import parse_ordering
+from asar.ordering import ordering_from_trace
+from asar.file.base import AsarFile
+from asar.file.base import DiskAsarFile
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+
+
+_logger = logging.getLogger(__name__)
 
 
 def pack(
@@ -10,15 +33,194 @@ def pack(
     unpack: str | None,
     unpack_dir: str | None,
     exclude_hidden: bool,
+    dedupe: bool = False,
+    trace: Path | None = None,
+    jobs: int | None = None,
+    codec: CodecType | None = None,
+    slack: int = DEFAULT_SLACK,
 ):
     """Pack a folder into the archive.
 
+    The folder is walked by os.scandir, hidden folders are pruned without walking them.
+    Symlinks are followed like the files or folders they point to, while dangling ones and
+    ones pointing to a folder being walked are skipped.
+
+    Header is written with placeholder integrity first. Files are read and hashed by a thread
+    pool ahead of a single writer, which writes them in order as they are ready, then header is
+    rewritten. So each file is read only once, and only a bounded size of them is in memory.
+    With dedupe, files are hashed by the pool before header instead, as duplicates have to be
+    known to place content, so they are read again when writing.
+    Unpacked files are copied to `<output>.unpacked` at the same time.
+
+    If codec is given, packed files are compressed by the pool into temporary files beside
+    output, so compressed content is never kept in memory. Files which do not get smaller are
+    stored as is, and unpacked files are never compressed. Only Asar of this package can read
+    compressed files.
+
+    Patterns are globs like minimatch used by @electron/asar: "*" and "?" do not match "/",
+    "**" matches any count of folders and "{a,b}" matches either. They are matched against
+    names of files or folders, or their relative paths if they contain "/". Unlike minimatch,
+    "*" matches names starting with "." too. Folders starting with unpack_dir literally are
+    unpacked as well.
+
     Args:
         dir_(Path): The folder to pack.
         output(Path): The path to generated archive.
-        ordering(Path | None): The path to a text file for ordering contents.
+        ordering(Path | None): The path to a text file for ordering contents,
+            which is in the format used by @electron/asar.
         unpack(str | None): The pattern which files will be skipped to pack.
         unpack_dir(str | None): The pattern which directories will be skipped to pack.
         exclude_hidden(bool): If skip packing hidden files.
+        dedupe(bool): If files with the same content share one region in archive.
+        trace(Path | None): The path to a trace of files accessed, which is used for ordering
+            contents after the ordering file, so files read together are contiguous.
+        jobs(int | None): The count of threads to read and hash files.
+            Count of cpus is used if it is None.
+        codec(CodecType | None): The codec to compress packed files with.
+        slack(int): The size of padding reserved in json header, so the first updates of
+            files in place do not rewrite the archive.
     """
-    raise NotImplementedError("Writing asar is not supported now.")
+    paths: list[PurePath] = []
+    if ordering is not None:
+        paths.extend(parse_ordering(ordering.read_text(encoding="utf-8").splitlines()))
+    if trace is not None:
+        paths.extend(ordering_from_trace(trace.read_text(encoding="utf-8").splitlines()))
+    _logger.info("Packing %s to %s...", dir_, output)
+
+    def _ingest(entry: os.DirEntry[str], unpacked: bool, spilled: Path | None) -> AsarFile:
+        file = DiskAsarFile.from_path(Path(entry.path), st=entry.stat())
+        if unpacked:
+            file.meta.offset = None
+        elif codec is not None and spilled is not None:
+            file = _compress(file, codec, spilled)
+        if dedupe:
+            file.sync_meta()
+        return file
+
+    asar = Asar()
+    with contextlib.ExitStack() as stack:
+        spill_dir: Path | None = None
+        if codec is not None:
+            spill_dir = Path(stack.enter_context(tempfile.TemporaryDirectory(dir=output.parent)))
+        with ThreadPoolExecutor(jobs or os.cpu_count()) as executor:
+            futures: list[tuple[PurePath, Future[AsarFile]]] = []
+            for i, (relative, entry, unpacked_parent) in enumerate(
+                _scan(dir_, exclude_hidden, unpack_dir),
+            ):
+                unpacked = unpacked_parent or _match(relative, unpack)
+                spilled = None if spill_dir is None else spill_dir / str(i)
+                futures.append((relative, executor.submit(_ingest, entry, unpacked, spilled)))
+            for relative, future in futures:
+                asar[relative] = future.result()
+        with output.open("wb") as f:
+            asar.write(f, unpacked_dir_of(output), dedupe, paths, jobs, slack)
+
+
+def _compress(file: DiskAsarFile, codec: CodecType, spilled: Path) -> DiskAsarFile:
+    # Compressed content is spilled to a temporary file, it is dropped if it is not smaller.
+    size = 0
+
+    def _count(chunks: Iterable[bytes]) -> Iterator[bytes]:
+        nonlocal size
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+
+    with spilled.open("wb") as out:
+        for chunk in compress(_count(file.iter_content()), codec):
+            _ = out.write(chunk)
+    compressed = DiskAsarFile.from_path(spilled)
+    if compressed.size >= size:
+        spilled.unlink()
+        return file
+    compressed.meta.executable = file.meta.executable
+    compressed.meta.codec = codec
+    compressed.meta.uncompressed_size = size
+    return compressed
+
+
+def _scan(
+    dir_: Path,
+    exclude_hidden: bool,
+    unpack_dir: str | None,
+    relative: PurePath | None = None,
+    unpacked: bool = False,
+    walking: frozenset[Path] | None = None,
+) -> Iterator[tuple[PurePath, os.DirEntry[str], bool]]:
+    # Yields relative paths of files, their entries and if they are in an unpacked folder.
+    # Real paths of folders being walked are tracked, so symlinks looping back are skipped.
+    if relative is None:
+        relative = PurePath()
+    walking = frozenset([*(walking or ()), (dir_ / relative).resolve()])
+    with os.scandir(dir_ / relative) as it:
+        entries = list(it)
+    for entry in entries:
+        if exclude_hidden and entry.name.startswith("."):
+            continue
+        path = relative / entry.name
+        if entry.is_symlink() and not Path(entry.path).exists():
+            _logger.warning("Skipping dangling symlink %s.", entry.path)
+        elif not entry.is_dir():
+            yield path, entry, unpacked
+        elif entry.is_symlink() and Path(entry.path).resolve() in walking:
+            _logger.warning("Skipping symlink %s to a folder being walked.", entry.path)
+        else:
+            yield from _scan(
+                dir_,
+                exclude_hidden,
+                unpack_dir,
+                path,
+                unpacked or _match(path, unpack_dir, True),
+                walking,
+            )
+
+
+def _match(path: PurePath, pattern: str | None, prefix: bool = False) -> bool:
+    # Like minimatch with matchBase used by @electron/asar, folders also match by prefix.
+    if pattern is None:
+        return False
+    if prefix and path.as_posix().startswith(pattern):
+        return True
+    target = path.as_posix() if "/" in pattern else path.name
+    return any(_translate(expanded).fullmatch(target) for expanded in _expand_braces(pattern))
+
+
+def _expand_braces(pattern: str) -> list[str]:
+    # "{a,b}c" is expanded to "ac" and "bc", the innermost braces are expanded first.
+    match = re.search(r"\{([^{}]*,[^{}]*)\}", pattern)
+    if match is None:
+        return [pattern]
+    return [
+        expanded
+        for option in match[1].split(",")
+        for expanded in _expand_braces(pattern[: match.start()] + option + pattern[match.end() :])
+    ]
+
+
+@functools.lru_cache
+def _translate(pattern: str) -> re.Pattern[str]:
+    # "*" and "?" never cross "/", while a "**" segment matches any count of folders.
+    parts: list[str] = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i) and (i == 0 or pattern[i - 1] == "/"):
+            parts.append("(?:.*/)?")
+            i += len("**/")
+        elif pattern[i:] == "**" and (i == 0 or pattern[i - 1] == "/"):
+            parts.append(".*")
+            i += len("**")
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and (end := pattern.find("]", i + 2)) > 0:
+            negated = pattern[i + 1] == "!"
+            body = pattern[i + 2 if negated else i + 1 : end].replace("\\", "\\\\")
+            parts.append(f"[{'^' if negated else ''}{body}]")
+            i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(parts))
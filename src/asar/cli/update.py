@@ -0,0 +1,95 @@
+"""Update files in the archive in place."""
+
+import os
+import shutil
+import logging
+import tempfile
+from asar import Asar
+from typing import BinaryIO
+from pathlib import Path
+from pathlib import PurePath
+from asar.header import DEFAULT_SLACK
+from asar.header import Alignment
+from asar.header import AsarHeader
+from asar.file.base import DiskAsarFile
+from collections.abc import Callable
+
+
+_logger = logging.getLogger(__name__)
+
+
+def update(archive: Path, path: PurePath, file: Path, slack: int = DEFAULT_SLACK):
+    """Add or replace a file in the archive without rewriting content of other files.
+
+    Content is appended to the end of archive, then only the header is rewritten. Json header
+    is padded with spaces, so it can grow in place. If it grows past the padding, the archive
+    is rewritten once with more padding, as offsets of files are relative to the end of header.
+    Content replaced stays in the archive until it is compacted.
+
+    Args:
+        archive(Path): The path to asar archive.
+        path(PurePath): The path to the file in archive.
+        file(Path): The path to the new content on disk.
+        slack(int): The size of padding added to json header when it has to grow.
+    """
+    _logger.info("Updating %s in %s...", path, archive)
+    source = DiskAsarFile.from_path(file)
+    source.sync_meta()
+    with archive.open("r+b") as f:
+        header = AsarHeader.read(f)
+        prefix_size = Alignment.DWORD.value * 4
+        end = f.seek(0, os.SEEK_END)
+        source.meta.offset = str(end - header.offset)
+        header.set(path, source.meta)
+        try:
+            data = header.encode(size=header.offset - prefix_size)
+        except ValueError:
+            _logger.info("Json header grows past its padding, relocating content...")
+        else:
+            # Content is written before header, so header never points to missing content.
+            _ = f.seek(end)
+            source.write(f)
+            f.flush()
+            _ = f.seek(0)
+            _ = f.write(data)
+            return
+        json_size = len(header.encode()) - prefix_size
+
+    def _relocate(out: BinaryIO):
+        _ = out.write(header.encode(size=json_size + slack))
+        with archive.open("rb") as f:
+            _ = f.seek(header.offset)
+            shutil.copyfileobj(f, out)
+        source.write(out)
+
+    _replace(archive, _relocate)
+
+
+def compact(archive: Path):
+    """Rewrite the archive to remove content which is not used by any file.
+
+    Files sharing content in the archive keep sharing it, as the archive is written with
+    dedupe if any packed files point to the same offset.
+
+    Args:
+        archive(Path): The path to asar archive.
+    """
+    _logger.info("Compacting %s...", archive)
+    with Asar.open(archive) as asar:
+        offsets = [f.meta.offset for f in asar.values() if f.meta.offset is not None]
+        dedupe = len(set(offsets)) < len(offsets)
+        _replace(archive, lambda out: asar.write(out, dedupe=dedupe))
+
+
+# Archive is written to a temporary file beside it, which is removed if anything fails.
+def _replace(archive: Path, write: Callable[[BinaryIO], None]):
+    fd, name = tempfile.mkstemp(dir=archive.parent)
+    out = Path(name)
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            write(fp)
+        shutil.copymode(archive, out)
+        _ = out.replace(archive)
+    except BaseException:
+        out.unlink(missing_ok=True)
+        raise
@@ -0,0 +1,26 @@
+"""Verify integrity of all files in the archive."""
+
+from asar import Asar
+from pathlib import Path
+from asar.integrity.base import ChecksumMismatchError
+from asar.integrity.verifier import IntegrityVerifier
+
+
+def verify(archive: Path, jobs: int | None):
+    """Verify integrity of all files in the archive and print every mismatch.
+
+    Args:
+        archive(Path): The path to the asar archive.
+        jobs(int | None): The count of threads to hash files. Count of cpus is used if it is None.
+
+    Raises:
+        ChecksumMismatchError: If any mismatch is found.
+    """
+    with Asar.open(archive) as asar:
+        mismatches = IntegrityVerifier(jobs).verify(asar)
+    for mismatch in mismatches:
+        where = "/" / mismatch.path
+        block = "" if mismatch.block is None else f" block {mismatch.block}"
+        print(f"{where}{block}: expected {mismatch.expected}, got {mismatch.actual}")
+    if len(mismatches) > 0:
+        raise ChecksumMismatchError(f"{len(mismatches)} checksum mismatches found.")
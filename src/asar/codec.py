@@ -0,0 +1,126 @@
+"""Compress content of files in archive with codecs from the standard library.
+
+This is an extension of the asar format, archives with compressed files can only be read by
+this package, not by Electron.
+"""
+
+import lzma
+import zlib
+from typing import Literal
+from typing import Protocol
+from collections.abc import Iterable
+from collections.abc import Iterator
+
+
+CodecType = Literal["zlib", "lzma"]
+CODECS: list[CodecType] = ["zlib", "lzma"]
+MAX_OUTPUT_SIZE = 1024 * 1024
+
+
+class _Compressor(Protocol):
+    def compress(self, data: bytes | memoryview, /) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+class _ZlibDecompressor(Protocol):
+    @property
+    def eof(self) -> bool: ...
+
+    @property
+    def unconsumed_tail(self) -> bytes: ...
+
+    def decompress(self, data: bytes | memoryview, /, max_length: int = 0) -> bytes: ...
+
+
+def _create_compressor(codec: CodecType) -> _Compressor:
+    match codec:
+        case "zlib":
+            return zlib.compressobj(9)
+        case "lzma":
+            return lzma.LZMACompressor()
+
+
+def _create_decompressor(codec: CodecType) -> _ZlibDecompressor | lzma.LZMADecompressor:
+    match codec:
+        case "zlib":
+            return zlib.decompressobj()
+        case "lzma":
+            return lzma.LZMADecompressor()
+
+
+def compress(chunks: Iterable[bytes | memoryview], codec: CodecType) -> Iterator[bytes]:
+    """Compress content in chunks.
+
+    Args:
+        chunks(Iterable[bytes | memoryview]): The chunks of content.
+        codec(CodecType): The codec to compress with.
+
+    Yields:
+        bytes: The chunks of compressed content.
+    """
+    compressor = _create_compressor(codec)
+    for chunk in chunks:
+        if compressed := compressor.compress(chunk):
+            yield compressed
+    yield compressor.flush()
+
+
+def decompress(
+    chunks: Iterable[bytes | memoryview],
+    codec: CodecType,
+    size: int | None = None,
+) -> Iterator[bytes]:
+    """Decompress content in chunks, so it is never fully loaded into memory.
+
+    Each chunk yielded is at most MAX_OUTPUT_SIZE, even if a small chunk of compressed content
+    expands to much more.
+
+    Args:
+        chunks(Iterable[bytes | memoryview]): The chunks of compressed content.
+        codec(CodecType): The codec content is compressed with.
+        size(int | None): The size of decompressed content, which is checked if it is given.
+
+    Yields:
+        bytes: The chunks of content.
+
+    Raises:
+        ValueError: If compressed content is invalid or truncated, or its size does not match.
+    """
+    decompressor = _create_decompressor(codec)
+    total = 0
+    for chunk in chunks:
+        for data in _decompress_chunk(decompressor, chunk, codec):
+            total += len(data)
+            if size is not None and total > size:
+                raise ValueError("Decompressed content is larger than its size.", codec, size)
+            yield data
+    if not decompressor.eof:
+        raise ValueError("Compressed content is truncated.", codec)
+    if size is not None and total != size:
+        raise ValueError("Decompressed content is smaller than its size.", codec, size)
+
+
+def _decompress_chunk(
+    decompressor: _ZlibDecompressor | lzma.LZMADecompressor,
+    chunk: bytes | memoryview,
+    codec: CodecType,
+) -> Iterator[bytes]:
+    # Input left after output reaches the limit is kept in unconsumed_tail by zlib,
+    # while lzma buffers it until it needs input again.
+    while True:
+        try:
+            data = decompressor.decompress(chunk, MAX_OUTPUT_SIZE)
+        except (zlib.error, lzma.LZMAError) as e:
+            raise ValueError("Invalid compressed content.", codec) from e
+        if data:
+            yield data
+        if isinstance(decompressor, lzma.LZMADecompressor):
+            if decompressor.eof or decompressor.needs_input:
+                return
+            chunk = b""
+        else:
+            chunk = decompressor.unconsumed_tail
+            # zlib may still hold output of consumed input when the limit is reached.
+            if len(chunk) == 0 and (decompressor.eof or len(data) < MAX_OUTPUT_SIZE):
+                return
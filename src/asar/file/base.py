@@ -1,40 +1,68 @@
 """Classes describing file in asar archive."""
 
+import os
+import stat
 from typing import Self
 from typing import Literal
+from typing import BinaryIO
 from typing import OrderedDict
 from typing import override
+from pathlib import Path
+from pathlib import PurePath
 from asar.base import MetaInfo
+from asar.codec import CODECS
+from asar.codec import CodecType
+from asar.codec import compress
+from asar.codec import decompress
+from dataclasses import field
 from dataclasses import dataclass
+from collections.abc import Iterable
+from collections.abc import Iterator
+from asar.integrity.base import DEFAULT_BLOCK_SIZE
 from asar.integrity.base import AlgorithmType
 from asar.integrity.base import IntegrityInfo
 from asar.integrity.base import IntegrityDictInfo
-from asar.integrity.sha256 import Sha256Checker
-from asar.integrity.checker import IntegrityChecker
+from asar.integrity.registry import get_checker
+
+
+CHUNK_SIZE = 1024 * 1024
 
 
 FileMetaDictInfo = OrderedDict[
-    Literal["offset", "size", "unpacked", "executable", "integrity"],
+    Literal["offset", "size", "unpacked", "executable", "codec", "uncompressedSize", "integrity"],
     str | int | bool | IntegrityDictInfo,
 ]
 
+FolderMetaDictInfo = dict[
+    Literal["files"],
+    dict[str, "FileMetaDictInfo | FolderMetaDictInfo"],
+]
+
 
-@dataclass
+@dataclass(slots=True)
 class FileMetaInfo(MetaInfo):
-    """Dataclass to save metainfo for a file in archive."""
+    """Dataclass to save metainfo for a file in archive.
+
+    Size and integrity describe content stored in archive, which is compressed if codec is set.
+    """
 
     offset: str | None
     size: int
     executable: bool
     integrity: IntegrityInfo
+    codec: CodecType | None = None
+    uncompressed_size: int | None = None
 
     @override
     @classmethod
     def from_json(cls, json: FileMetaDictInfo) -> Self:
         offset: str | None = None
         size: int | None = None
+        unpacked = False
         executable = False
         integrity: IntegrityInfo | None = None
+        codec: CodecType | None = None
+        uncompressed_size: int | None = None
         for k, v in json.items():
             match k:
                 case "offset":
@@ -49,8 +77,7 @@ class FileMetaInfo(MetaInfo):
                         raise ValueError("Invalid size", v)
                 case "unpacked":
                     if isinstance(v, bool):
-                        if v:
-                            size = None
+                        unpacked = v
                     else:
                         raise ValueError("Invalid unpacked", v)
                 case "executable":
@@ -58,16 +85,32 @@ class FileMetaInfo(MetaInfo):
                         executable = v
                     else:
                         raise ValueError("Invalid executable", v)
+                case "codec":
+                    if v in CODECS:
+                        codec = v
+                    else:
+                        raise ValueError("Invalid codec", v)
+                case "uncompressedSize":
+                    if isinstance(v, int) and not isinstance(v, bool):
+                        uncompressed_size = v
+                    else:
+                        raise ValueError("Invalid uncompressedSize", v)
                 case "integrity":
                     if isinstance(v, dict):
                         integrity = IntegrityInfo.from_json(v)
                     else:
                         raise ValueError("Invalid integrity", v)
+        if unpacked:
+            offset = None
         if size is None:
             raise ValueError("No size in json.")
         if integrity is None:
             raise ValueError("No integrity in json.")
-        return cls(offset, size, executable, integrity)
+        if codec is not None and uncompressed_size is None:
+            raise ValueError("No uncompressedSize in json.")
+        if codec is None and uncompressed_size is not None:
+            raise ValueError("Invalid uncompressedSize without codec", uncompressed_size)
+        return cls(offset, size, executable, integrity, codec, uncompressed_size)
 
     @override
     def to_json(self) -> FileMetaDictInfo:
@@ -79,6 +122,9 @@ class FileMetaInfo(MetaInfo):
             json["unpacked"] = True
         if self.executable:
             json["executable"] = self.executable
+        if self.codec is not None:
+            json["codec"] = self.codec
+            json["uncompressedSize"] = self.content_size
         json["integrity"] = self.integrity.to_json()
         return json
 
@@ -87,22 +133,424 @@ class FileMetaInfo(MetaInfo):
         """If this file is not contained in the archive."""
         return self.offset is None
 
+    @property
+    def content_size(self) -> int:
+        """Size of content after decompression."""
+        if self.codec is None or self.uncompressed_size is None:
+            return self.size
+        return self.uncompressed_size
+
 
-@dataclass
+@dataclass(slots=True, init=False)
 class AsarFile:
-    """Dataclass to save a file in archive."""
+    """Dataclass to save a file in archive.
+
+    Meta info is assumed to describe the content given, it is synced with content again only
+    after content is replaced, so unchanged files are never hashed when writing archive.
+    """
 
     meta: FileMetaInfo
-    content: bytes
+    _content: bytes | memoryview
+    _synced: bytes | memoryview | None = field(default=None, repr=False, compare=False)
+
+    def __init__(self, meta: FileMetaInfo, content: bytes | memoryview):
+        """Initialize with meta info describing content given.
+
+        Args:
+            meta(FileMetaInfo): The meta info of file.
+            content(bytes | memoryview): The content of file.
+        """
+        self.meta = meta
+        self._content = content
+        self._synced = content
+
+    @property
+    def content(self) -> bytes | memoryview:
+        """Content of file, meta info is synced with it again after it is replaced."""
+        return self._content
+
+    @content.setter
+    def content(self, value: bytes | memoryview):
+        self._content = value
+
+    @classmethod
+    def from_content(
+        cls,
+        content: bytes | memoryview,
+        executable: bool = False,
+        algorithm: AlgorithmType = "SHA256",
+        codec: CodecType | None = None,
+    ) -> Self:
+        """Create a file whose meta info is generated from content.
+
+        Args:
+            content(bytes | memoryview): The content of file.
+            executable(bool): If the file is executable.
+            algorithm(AlgorithmType): The algorithm to generate integrity.
+            codec(CodecType | None): The codec to compress content with.
+                Content is stored as is if it is None or compressing does not make it smaller.
+
+        Returns:
+            Self: The file, which is not in any position of archive yet.
+        """
+        uncompressed_size: int | None = None
+        if codec is not None:
+            compressed = b"".join(compress([content], codec))
+            if len(compressed) < len(content):
+                uncompressed_size = len(content)
+                content = compressed
+            else:
+                codec = None
+        integrity = _placeholder_integrity(algorithm, DEFAULT_BLOCK_SIZE, len(content))
+        meta = FileMetaInfo("0", len(content), executable, integrity, codec, uncompressed_size)
+        file = cls(meta, content)
+        file._synced = None
+        return file
+
+    @property
+    def size(self) -> int:
+        """Size of content."""
+        return len(self.content)
+
+    @property
+    def dirty(self) -> bool:
+        """If integrity in meta info may not match content."""
+        return self.content is not self._synced
+
+    def iter_content(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes | memoryview]:
+        """Iterate content in chunks.
+
+        Args:
+            chunk_size(int): The max size of each chunk.
+
+        Yields:
+            bytes | memoryview: The chunk of content.
+        """
+        view = memoryview(self.content)
+        for i in range(0, len(view), chunk_size):
+            yield view[i : i + chunk_size]
 
-    @staticmethod
-    def _get_checkers(checksum: AlgorithmType) -> IntegrityChecker:
-        known_checkers: dict[AlgorithmType, IntegrityChecker] = {
-            "SHA256": Sha256Checker(),
-        }
-        return known_checkers[checksum]
+    def read(self, start: int = 0, length: int | None = None) -> bytes | memoryview:
+        """Read a range of content.
+
+        Args:
+            start(int): The position to start reading.
+            length(int | None): The max size to read. Read to the end if it is None.
+
+        Returns:
+            bytes | memoryview: The content in range, which is a slice of content if possible.
+        """
+        end = self.size if length is None else min(self.size, start + length)
+        return memoryview(self.content)[start:end]
+
+    def iter_decompressed(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes | memoryview]:
+        """Iterate content in chunks, which is decompressed if it is compressed.
+
+        Args:
+            chunk_size(int): The max size of each chunk read from content.
+
+        Yields:
+            bytes | memoryview: The chunk of decompressed content.
+        """
+        chunks = self.iter_content(chunk_size)
+        if self.meta.codec is None:
+            yield from chunks
+        else:
+            yield from decompress(chunks, self.meta.codec, self.meta.content_size)
+
+    def decompress(self, start: int = 0, length: int | None = None) -> bytes | memoryview:
+        """Read a range of decompressed content, see AsarFile.read.
+
+        Compressed content is decompressed in chunks until the end of the range,
+        so the rest of it is never decompressed. As each call decompresses from the start,
+        callers reading many ranges should keep decompressed content, like AsarFS does.
+
+        Args:
+            start(int): The position in decompressed content to start reading.
+            length(int | None): The max size to read. Read to the end if it is None.
+
+        Returns:
+            bytes | memoryview: The decompressed content in range.
+        """
+        if self.meta.codec is None:
+            return self.read(start, length)
+        size = self.meta.content_size
+        end = size if length is None else min(size, start + length)
+        parts: list[bytes | memoryview] = []
+        position = 0
+        for chunk in self.iter_decompressed():
+            if position >= end:
+                break
+            if position + len(chunk) > start:
+                parts.append(chunk[max(0, start - position) : end - position])
+            position += len(chunk)
+        return b"".join(parts)
+
+    def check_range(self, start: int, length: int, verified: set[int] | None = None) -> bool:
+        """Check integrity of blocks overlapping a range of content only.
+
+        Args:
+            start(int): The position where the range starts.
+            length(int): The size of the range.
+            verified(set[int] | None): Indexes of blocks already verified, which are skipped.
+                Indexes of blocks which are valid are added to it.
+
+        Returns:
+            bool: If all blocks overlapping the range are valid.
+        """
+        if verified is None:
+            verified = set()
+        integrity = self.meta.integrity
+        checker = get_checker(integrity.algorithm)
+        end = min(self.size, start + length)
+        if end <= start:
+            return True
+        for i in range(start // integrity.blocksize, (end - 1) // integrity.blocksize + 1):
+            if i in verified:
+                continue
+            block = self.read(i * integrity.blocksize, integrity.blocksize)
+            if not checker.check_block(block, integrity, i):
+                return False
+            verified.add(i)
+        return True
+
+    def sync_meta(self):
+        """Generate size and integrity in meta info if the file is dirty."""
+        if self.dirty:
+            self._sync_meta(self.iter_content())
+
+    def reserve_integrity(self):
+        """Replace integrity with a placeholder which has the same json length of the real one.
+
+        So a header can be written before content is hashed by write().
+        """
+        integrity = self.meta.integrity
+        self.meta.integrity = _placeholder_integrity(
+            integrity.algorithm,
+            integrity.blocksize,
+            self.size,
+        )
+
+    def write(self, fp: BinaryIO):
+        """Write content to the stream in chunks.
+
+        If the file is dirty, meta info is synced with chunks written at the same time,
+        so content is read only once.
+
+        Args:
+            fp(BinaryIO): The stream to write content to.
+        """
+        chunks = self.iter_content()
+        if self.dirty:
+            self._sync_meta(_write_through(fp, chunks))
+        else:
+            for chunk in chunks:
+                _ = fp.write(chunk)
+
+    def load(self) -> bytes | memoryview:
+        """Read whole content, and sync meta info with it if the file is dirty.
+
+        So content can be read and hashed by another thread ahead of writing it.
+
+        Returns:
+            bytes | memoryview: The content.
+        """
+        content = self.content
+        if self.dirty:
+            self._sync_meta([content])
+        return content
+
+    def extract(self, target: Path):
+        """Write decompressed content to a file on disk in chunks.
+
+        The file written is made executable if this file is marked so.
+
+        Args:
+            target(Path): The path to the file to write.
+        """
+        with target.open("wb") as out:
+            for chunk in self.iter_decompressed():
+                _ = out.write(chunk)
+        if self.meta.executable:
+            mode = target.stat().st_mode
+            target.chmod(mode | stat.S_IXOTH | stat.S_IXGRP | stat.S_IXUSR)
 
     def check(self) -> bool:
         """Check integrity."""
-        checker = AsarFile._get_checkers(self.meta.integrity.algorithm)
+        checker = get_checker(self.meta.integrity.algorithm)
         return checker.check(self.content, self.meta.integrity)
+
+    def _sync_meta(self, chunks: Iterable[bytes | memoryview]):
+        size = 0
+
+        def _count(chunks: Iterable[bytes | memoryview]) -> Iterator[bytes | memoryview]:
+            nonlocal size
+            for chunk in chunks:
+                size += len(chunk)
+                yield chunk
+
+        integrity = self.meta.integrity
+        checker = get_checker(integrity.algorithm)
+        self.meta.integrity = checker.generate(_count(chunks), integrity.blocksize)
+        self.meta.size = size
+        self._mark_synced()
+
+    def _mark_synced(self):
+        self._synced = self.content
+
+
+class DiskAsarFile(AsarFile):
+    """A file in archive whose content is kept on disk until it is accessed."""
+
+    def __init__(self, meta: FileMetaInfo, source: Path, dirty: bool = True):
+        """Initialize with meta info and the path to content.
+
+        Args:
+            meta(FileMetaInfo): The meta info of file.
+            source(Path): The path to the file on disk.
+            dirty(bool): If integrity in meta info may not match the file.
+        """
+        self.meta = meta
+        self.source = source
+        self._dirty = dirty
+
+    # Generated methods of AsarFile compare and show content, which would read whole file.
+    __hash__ = None
+
+    @override
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(meta={self.meta!r}, source={self.source!r})"
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DiskAsarFile):
+            return NotImplemented
+        return type(self) is type(other) and (self.meta, self.source) == (other.meta, other.source)
+
+    @classmethod
+    def from_path(
+        cls,
+        source: Path,
+        algorithm: AlgorithmType = "SHA256",
+        st: os.stat_result | None = None,
+    ) -> Self:
+        """Create a file whose meta info is generated from the file on disk.
+
+        Size and mode are got from os.stat, while integrity is generated when the file is
+        written or sync_meta() is called.
+
+        Args:
+            source(Path): The path to the file on disk.
+            algorithm(AlgorithmType): The algorithm to generate integrity.
+            st(os.stat_result | None): The stat result of the file if it is already got,
+                like from os.scandir.
+
+        Returns:
+            Self: The file, which is not in any position of archive yet.
+        """
+        if st is None:
+            st = source.stat()
+        integrity = _placeholder_integrity(algorithm, DEFAULT_BLOCK_SIZE, st.st_size)
+        meta = FileMetaInfo("0", st.st_size, bool(st.st_mode & stat.S_IXUSR), integrity)
+        return cls(meta, source)
+
+    @property
+    @override
+    def content(self) -> bytes:
+        """Content read from disk, which can not be replaced."""
+        return self.source.read_bytes()
+
+    @content.setter
+    @override
+    def content(self, value: bytes | memoryview):
+        raise AttributeError("Content of file on disk can not be replaced.", self.source)
+
+    @property
+    @override
+    def size(self) -> int:
+        return self.meta.size
+
+    @property
+    @override
+    def dirty(self) -> bool:
+        return self._dirty
+
+    @override
+    def iter_content(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        return _read_chunks(self.source, chunk_size)
+
+    @override
+    def read(self, start: int = 0, length: int | None = None) -> bytes:
+        end = self.size if length is None else min(self.size, start + length)
+        with self.source.open("rb") as f:
+            _ = f.seek(start)
+            return f.read(max(0, end - start))
+
+    @override
+    def _mark_synced(self):
+        self._dirty = False
+
+
+class UnpackedAsarFile(DiskAsarFile):
+    """A file in archive whose content is stored in the unpacked folder beside archive."""
+
+    def __init__(self, meta: FileMetaInfo, path: PurePath, unpacked_dir: Path | None):
+        """Initialize with meta info and where content is.
+
+        Args:
+            meta(FileMetaInfo): The meta info of file.
+            path(PurePath): The path to the file in archive.
+            unpacked_dir(Path | None): The unpacked folder beside archive, None if it is unknown.
+        """
+        self.meta = meta
+        self.path = path
+        self.unpacked_dir = unpacked_dir
+        self._dirty = False
+
+    __hash__ = None
+
+    @override
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(meta={self.meta!r}, path={self.path!r})"
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, UnpackedAsarFile):
+            return NotImplemented
+        return (self.meta, self.path, self.unpacked_dir) == (
+            other.meta,
+            other.path,
+            other.unpacked_dir,
+        )
+
+    @property
+    def source(self) -> Path:
+        """The path to content, which is resolved when content is accessed.
+
+        Raises:
+            RuntimeError: If unpacked folder of archive is unknown.
+        """
+        if self.unpacked_dir is None:
+            raise RuntimeError("This file is unpacked.")
+        return self.unpacked_dir / self.path
+
+
+def _read_chunks(path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    with path.open("rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def _write_through(
+    fp: BinaryIO,
+    chunks: Iterable[bytes | memoryview],
+) -> Iterator[bytes | memoryview]:
+    for chunk in chunks:
+        _ = fp.write(chunk)
+        yield chunk
+
+
+def _placeholder_integrity(algorithm: AlgorithmType, blocksize: int, size: int) -> IntegrityInfo:
+    empty = get_checker(algorithm).generate([], blocksize)
+    # Checksums have fixed length, and there is always a block after the last full one.
+    return IntegrityInfo(algorithm, empty.hash_, blocksize, empty.blocks * (size // blocksize + 1))
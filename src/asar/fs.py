@@ -0,0 +1,321 @@
+"""Read-only filesystem view of asar archive, files are read without extracting them."""
+
+import io
+import logging
+import threading
+from asar import Asar
+from types import TracebackType
+from typing import Self
+from pathlib import Path
+from pathlib import PurePath
+from asar.cache import HeaderCache
+from asar.header import Alignment
+from collections import OrderedDict
+from dataclasses import dataclass
+from collections.abc import Iterator
+
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 32 * 1024 * 1024
+_ROOT = PurePath()
+
+
+@dataclass(slots=True, frozen=True)
+class AsarStat:
+    """Dataclass to save status of a path in archive."""
+
+    path: PurePath
+    is_dir: bool
+    size: int
+    executable: bool
+    unpacked: bool
+
+
+class ContentCache:
+    """Contents of files bounded by total size, least recently used ones are dropped first.
+
+    It is safe to share one cache between threads and between filesystems of many archives.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE):
+        """Initialize an empty cache.
+
+        Args:
+            max_size(int): The max total size of contents in bytes.
+                Contents larger than it are never cached.
+        """
+        self.max_size = max_size
+        self.size = 0
+        self._entries: OrderedDict[tuple[object, PurePath], bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Count of cached contents."""
+        return len(self._entries)
+
+    def get(self, key: tuple[object, PurePath]) -> bytes | None:
+        """Get cached content and mark it as recently used.
+
+        Args:
+            key(tuple[object, PurePath]): The owner of content and the path to the file.
+
+        Returns:
+            bytes | None: The content, None if it is not cached.
+        """
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            return content
+
+    def put(self, key: tuple[object, PurePath], content: bytes):
+        """Store content, then drop least recently used ones if cache is too large.
+
+        Args:
+            key(tuple[object, PurePath]): The owner of content and the path to the file.
+            content(bytes): The content.
+        """
+        if len(content) > self.max_size:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._entries[key] = content
+            self.size += len(content)
+            while self.size > self.max_size:
+                _, dropped = self._entries.popitem(last=False)
+                self.size -= len(dropped)
+
+    def clear(self):
+        """Drop all contents."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class AsarFS:
+    """Read-only filesystem view of an archive.
+
+    Folders are indexed once, so looking up any path costs the same as a dict lookup.
+    Contents are verified when they are read for the first time, and kept in a content cache
+    so reading them again neither touches the archive nor hashes them.
+    """
+
+    def __init__(
+        self,
+        asar: Asar,
+        cache: ContentCache | None = None,
+        verify: bool = True,
+    ):
+        """Initialize with an archive.
+
+        Args:
+            asar(Asar): The archive, which should not be changed while the view is used.
+            cache(ContentCache | None): The cache to keep contents.
+                A cache owned by this view is created if it is None.
+            verify(bool): If check integrity of files before returning their contents.
+        """
+        self.asar = asar
+        self.cache = cache if cache is not None else ContentCache()
+        self.verify = verify
+        self._owns_asar = False
+        # Contents of this view in a shared cache are keyed by it.
+        self._key = object()
+        self._folders: dict[PurePath, list[str]] = {_ROOT: []}
+        for folder in asar.iter_folders():
+            self._folders[folder] = []
+            self._folders[folder.parent].append(folder.name)
+        for path in asar.iter_files():
+            self._folders[path.parent].append(path.name)
+
+    @classmethod
+    def from_path(
+        cls,
+        path: Path,
+        alignment: Alignment = Alignment.DWORD,
+        *,
+        header_cache: HeaderCache | None = None,
+        cache: ContentCache | None = None,
+        verify: bool = True,
+    ) -> Self:
+        """Open an archive with Asar.open and view it, the archive is closed with the view.
+
+        Args:
+            path(Path): The path to asar archive.
+            alignment(Alignment): How the archive is aligned.
+            header_cache(HeaderCache | None): The cache to load parsed header from.
+            cache(ContentCache | None): The cache to keep contents.
+            verify(bool): If check integrity of files before returning their contents.
+
+        Returns:
+            Self: The view, which should be closed after using.
+        """
+        asar = Asar.open(path, alignment, cache=header_cache)
+        try:
+            fs = cls(asar, cache, verify)
+        except BaseException:
+            asar.close()
+            raise
+        fs._owns_asar = True
+        return fs
+
+    def close(self):
+        """Close the archive if it is opened by AsarFS.from_path, cached contents are kept valid."""
+        if self._owns_asar:
+            self.asar.close()
+
+    def __enter__(self) -> Self:
+        """Use view as a context manager, which closes it when exiting."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ):
+        """Close the view."""
+        self.close()
+
+    def exists(self, path: PurePath) -> bool:
+        """If a file or folder exists in archive."""
+        path = self._normalize(path)
+        return path in self._folders or path in self.asar
+
+    def is_dir(self, path: PurePath) -> bool:
+        """If the path is a folder in archive."""
+        return self._normalize(path) in self._folders
+
+    def is_file(self, path: PurePath) -> bool:
+        """If the path is a file in archive."""
+        return self._normalize(path) in self.asar
+
+    def stat(self, path: PurePath) -> AsarStat:
+        """Get status of a file or folder.
+
+        Args:
+            path(PurePath): The path in archive.
+
+        Returns:
+            AsarStat: The status, size of folders is 0 and size of files is the size after
+                decompression.
+
+        Raises:
+            FileNotFoundError: If the path does not exist.
+        """
+        path = self._normalize(path)
+        if path in self._folders:
+            return AsarStat(path, True, 0, False, False)
+        f = self.asar.get(path)
+        if f is None:
+            raise FileNotFoundError(path)
+        return AsarStat(path, False, f.meta.content_size, f.meta.executable, f.meta.unpacked)
+
+    def listdir(self, path: PurePath = _ROOT) -> list[str]:
+        """List names of files and folders in a folder.
+
+        Args:
+            path(PurePath): The path to the folder in archive.
+
+        Returns:
+            list[str]: The sorted names.
+
+        Raises:
+            FileNotFoundError: If the path does not exist.
+            NotADirectoryError: If the path is a file.
+        """
+        return sorted(self._get_folder(self._normalize(path)))
+
+    def walk(
+        self,
+        top: PurePath = _ROOT,
+    ) -> Iterator[tuple[PurePath, list[str], list[str]]]:
+        """Walk folders from top to bottom like os.walk.
+
+        Args:
+            top(PurePath): The path to the folder to start.
+
+        Yields:
+            tuple[PurePath, list[str], list[str]]: The path to each folder, and sorted names of
+                its subfolders and files. Subfolders removed from the list are not walked.
+
+        Raises:
+            FileNotFoundError: If top does not exist.
+            NotADirectoryError: If top is a file.
+        """
+        stack = [self._normalize(top)]
+        _ = self._get_folder(stack[0])
+        while len(stack) > 0:
+            folder = stack.pop()
+            folders: list[str] = []
+            files: list[str] = []
+            for name in sorted(self._folders[folder]):
+                (folders if folder / name in self._folders else files).append(name)
+            yield folder, folders, files
+            stack.extend(folder / name for name in reversed(folders))
+
+    def read_bytes(self, path: PurePath) -> bytes:
+        """Read content of a file through the content cache.
+
+        Args:
+            path(PurePath): The path to the file in archive.
+
+        Returns:
+            bytes: The content.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            IsADirectoryError: If the path is a folder.
+            ChecksumMismatchError: If content of the file does not match its integrity.
+            ValueError: If the file is invalid.
+        """
+        path = self._normalize(path)
+        key = self._key, path
+        content = self.cache.get(key)
+        if content is not None:
+            return content
+        if path in self._folders:
+            raise IsADirectoryError(path)
+        if path not in self.asar:
+            raise FileNotFoundError(path)
+        _logger.debug("Content cache miss: %s", path)
+        content = bytes(self.asar.read(path, verify=self.verify))
+        self.cache.put(key, content)
+        return content
+
+    def read_text(self, path: PurePath, encoding: str = "utf-8") -> str:
+        """Read content of a file as text, see AsarFS.read_bytes.
+
+        Args:
+            path(PurePath): The path to the file in archive.
+            encoding(str): The encoding of content.
+
+        Returns:
+            str: The decoded content.
+        """
+        return self.read_bytes(path).decode(encoding)
+
+    def open(self, path: PurePath) -> io.BytesIO:
+        """Open a file for reading in binary mode, see AsarFS.read_bytes.
+
+        Args:
+            path(PurePath): The path to the file in archive.
+
+        Returns:
+            io.BytesIO: The file object.
+        """
+        return io.BytesIO(self.read_bytes(path))
+
+    def _get_folder(self, path: PurePath) -> list[str]:
+        children = self._folders.get(path)
+        if children is not None:
+            return children
+        if path in self.asar:
+            raise NotADirectoryError(path)
+        raise FileNotFoundError(path)
+
+    @staticmethod
+    def _normalize(path: PurePath) -> PurePath:
+        return path.relative_to("/") if path.is_absolute() else path
@@ -0,0 +1,267 @@
+"""Read json header of asar archive without touching content of files."""
+
+import os
+import sys
+import json
+import math
+import logging
+import importlib
+from enum import Enum
+from typing import Self
+from typing import BinaryIO
+from typing import TypeGuard
+from typing import cast
+from pathlib import Path
+from pathlib import PurePath
+from asar.cache import HeaderCache
+from asar.file.base import FileMetaInfo
+from asar.file.base import FileMetaDictInfo
+from asar.file.base import FolderMetaDictInfo
+from collections.abc import Iterator
+
+
+# orjson is optional and untyped, so it is loaded as a module whose members are Any.
+try:
+    orjson = importlib.import_module("orjson")
+except ImportError:
+    orjson = None
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_SLACK = 64 * 1024
+
+
+class Alignment(Enum):
+    """How many bytes are the asar archive is aligned in."""
+
+    DWORD = 4
+
+
+def is_folder_meta_dict_info(
+    meta: FileMetaDictInfo | FolderMetaDictInfo,
+) -> TypeGuard[FolderMetaDictInfo]:
+    """If meta info in json header describes a folder.
+
+    Folders may be marked as unpacked too, but only files are handled as unpacked.
+    """
+    return "files" in meta
+
+
+def is_file_meta_dict_info(
+    meta: FileMetaDictInfo | FolderMetaDictInfo,
+) -> TypeGuard[FileMetaDictInfo]:
+    """If meta info in json header describes a file."""
+    return "files" not in meta
+
+
+def unpacked_dir_of(archive: Path) -> Path:
+    """Get the folder storing unpacked files of archive.
+
+    Args:
+        archive(Path): The path to the archive.
+
+    Returns:
+        Path: The `<archive>.unpacked` folder beside archive.
+    """
+    return archive.with_name(archive.name + ".unpacked")
+
+
+class AsarHeader:
+    """Json header of an asar archive and the position where content of files starts."""
+
+    def __init__(self, json_header: FolderMetaDictInfo, offset: int):
+        """Initialize with parsed json header.
+
+        Args:
+            json_header(FolderMetaDictInfo): The json header.
+            offset(int): The position where content of files starts in the archive.
+        """
+        self.json = json_header
+        self.offset = offset
+
+    @classmethod
+    def parse(cls, raw: bytes | memoryview, alignment: Alignment = Alignment.DWORD) -> Self:
+        """Parse header at the beginning of raw archive.
+
+        Args:
+            raw(bytes | memoryview): The content of asar archive, at least the header part.
+            alignment(Alignment): How the archive is aligned.
+
+        Returns:
+            Self: The header.
+        """
+        size = cls._parse_size(raw[: alignment.value * 4], alignment)
+        start = alignment.value * 4
+        return cls._parse_json(bytes(raw[start : start + size]), alignment)
+
+    @classmethod
+    def read(
+        cls,
+        fp: BinaryIO,
+        alignment: Alignment = Alignment.DWORD,
+        cache: HeaderCache | None = None,
+    ) -> Self:
+        """Read header from the beginning of archive, content of files is never read.
+
+        Args:
+            fp(BinaryIO): The archive opened in binary mode.
+            alignment(Alignment): How the archive is aligned.
+            cache(HeaderCache | None): The cache to load parsed header from,
+                header is parsed and stored into it if it is not cached.
+
+        Returns:
+            Self: The header.
+        """
+        _ = fp.seek(0)
+        size = cls._parse_size(fp.read(alignment.value * 4), alignment)
+        json_header_bytes = fp.read(size)
+        if cache is None:
+            return cls._parse_json(json_header_bytes, alignment)
+        key = cache.key(fp, json_header_bytes)
+        cached = cache.get(key)
+        if isinstance(cached, dict):
+            return cls(cached, cls._get_offset(size, alignment))  # type: ignore
+        header = cls._parse_json(json_header_bytes, alignment)
+        cache.put(key, header.json)
+        return header
+
+    def get(self, path: PurePath) -> FileMetaInfo:
+        """Get meta info of a file by walking json header directly.
+
+        Args:
+            path(PurePath): The path to the file in archive.
+
+        Returns:
+            FileMetaInfo: The meta info of the file.
+
+        Raises:
+            KeyError: If the file does not exist.
+        """
+        if path.is_absolute():
+            path = path.relative_to("/")
+        meta: FileMetaDictInfo | FolderMetaDictInfo = self.json
+        for name in path.parts:
+            if not is_folder_meta_dict_info(meta) or name not in meta["files"]:
+                raise KeyError(path)
+            meta = meta["files"][name]
+        if not is_file_meta_dict_info(meta):
+            raise KeyError(path)
+        return FileMetaInfo.from_json(meta)
+
+    def set(self, path: PurePath, meta: FileMetaInfo):
+        """Set meta info of a file in json header, folders are created if they do not exist.
+
+        Args:
+            path(PurePath): The path to the file in archive.
+            meta(FileMetaInfo): The meta info of the file.
+
+        Raises:
+            ValueError: If any parent of the path is a file, or the path is a folder.
+        """
+        if path.is_absolute():
+            path = path.relative_to("/")
+        folder = self.json
+        for name in path.parent.parts:
+            child = folder["files"].setdefault(name, {"files": {}})
+            if not is_folder_meta_dict_info(child):
+                raise ValueError("Parent is a file.", path)
+            folder = child
+        if is_folder_meta_dict_info(folder["files"].get(path.name, {})):
+            raise ValueError("Path is a folder.", path)
+        folder["files"][path.name] = meta.to_json()
+
+    def encode(self, alignment: Alignment = Alignment.DWORD, size: int | None = None) -> bytes:
+        """Encode json header with its prefix, which is written at the beginning of archive.
+
+        Args:
+            alignment(Alignment): How the archive is aligned.
+            size(int | None): The size of json in header. Json is padded with spaces to it,
+                so header can grow in place later. Size of json is used if it is None.
+
+        Returns:
+            bytes: The header.
+
+        Raises:
+            ValueError: If json is larger than the size.
+        """
+        json_header = json.dumps(self.json, separators=(",", ":")).encode()
+        if size is not None:
+            if len(json_header) > size:
+                raise ValueError("Json header is larger than the size.", size)
+            json_header += b" " * (size - len(json_header))
+        size = len(json_header)
+        padding = bytes(math.ceil(size / alignment.value) * alignment.value - size)
+
+        def _pickle(data: bytes) -> bytes:
+            return len(data).to_bytes(alignment.value, sys.byteorder) + data
+
+        size_bytes = size.to_bytes(alignment.value, sys.byteorder)
+        prefix = _pickle(_pickle(size_bytes + json_header + padding))
+        return alignment.value.to_bytes(alignment.value, sys.byteorder) + prefix
+
+    def walk(self) -> Iterator[tuple[PurePath, FileMetaInfo | None]]:
+        """Walk json header in the order of paths, folders are followed by their content.
+
+        Yields:
+            tuple[PurePath, FileMetaInfo | None]: The path of each entry and its meta info,
+                which is None for folders.
+        """
+        yield from self._walk_recursively(self.json, PurePath())
+
+    def read_content(self, fp: BinaryIO, meta: FileMetaInfo) -> bytes:
+        """Read content of a file from archive at its position.
+
+        Args:
+            fp(BinaryIO): The archive opened in binary mode.
+            meta(FileMetaInfo): The meta info of the file.
+
+        Returns:
+            bytes: The content of the file.
+
+        Raises:
+            RuntimeError: If the file is unpacked.
+        """
+        if meta.offset is None:
+            raise RuntimeError("This file is unpacked.")
+        position = self.offset + int(meta.offset)
+        if hasattr(os, "pread"):
+            return os.pread(fp.fileno(), meta.size, position)
+        _ = fp.seek(position)
+        return fp.read(meta.size)
+
+    def _walk_recursively(
+        self,
+        data: FolderMetaDictInfo,
+        parent: PurePath,
+    ) -> Iterator[tuple[PurePath, FileMetaInfo | None]]:
+        for name in sorted(data["files"]):
+            meta = data["files"][name]
+            if is_file_meta_dict_info(meta):
+                yield parent / name, FileMetaInfo.from_json(meta)
+            elif is_folder_meta_dict_info(meta):
+                yield parent / name, None
+                yield from self._walk_recursively(meta, parent / name)
+
+    @staticmethod
+    def _parse_size(prefix: bytes | memoryview, alignment: Alignment) -> int:
+        magic_bytes = alignment.value.to_bytes(alignment.value, sys.byteorder)
+        if prefix[: alignment.value] != magic_bytes:
+            raise ValueError("Invalid file magic header.")
+        size = prefix[alignment.value * 3 : alignment.value * 4]
+        return int.from_bytes(size, sys.byteorder)
+
+    @classmethod
+    def _parse_json(cls, json_header_bytes: bytes, alignment: Alignment) -> Self:
+        # orjson is much faster for large headers, use it if installed.
+        json_header = cast(
+            FolderMetaDictInfo,
+            orjson.loads(json_header_bytes)
+            if orjson is not None
+            else json.loads(json_header_bytes),
+        )
+        return cls(json_header, cls._get_offset(len(json_header_bytes), alignment))
+
+    @staticmethod
+    def _get_offset(size: int, alignment: Alignment) -> int:
+        padding = math.ceil(size / alignment.value) * alignment.value - size
+        return alignment.value * 4 + size + padding
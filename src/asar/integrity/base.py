@@ -9,13 +9,18 @@ from dataclasses import dataclass
 
 
 AlgorithmType = Literal["SHA256"]
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
 IntegrityDictInfo = OrderedDict[
     Literal["algorithm", "hash", "blockSize", "blocks"],
     AlgorithmType | str | int | list[str],
 ]
 
 
-@dataclass
+class ChecksumMismatchError(ValueError):
+    """Raises when content of a file does not match its integrity."""
+
+
+@dataclass(slots=True)
 class IntegrityInfo(MetaInfo):
     """Dataclass to save integrity info."""
 
@@ -37,7 +42,7 @@ class IntegrityInfo(MetaInfo):
                     if isinstance(v, str):
                         match v:
                             case "SHA256":
-                                algorithm = v
+                                algorithm = "SHA256"
                             case _:
                                 raise NotImplementedError("Unsupported algorithm", v)
                     else:
@@ -49,7 +54,8 @@ class IntegrityInfo(MetaInfo):
                         raise ValueError("Invalid hash", v)
                 case "blockSize":
                     if isinstance(v, int):
-                        blocksize = v
+                        # Share the same int object, large ints are not cached by python.
+                        blocksize = DEFAULT_BLOCK_SIZE if v == DEFAULT_BLOCK_SIZE else v
                     else:
                         raise ValueError("Invalid blockSize", v)
                 case "blocks":
@@ -65,6 +71,9 @@ class IntegrityInfo(MetaInfo):
             raise ValueError("No blockSize in json.")
         if blocks is None:
             raise ValueError("No blocks in json.")
+        # The only block of a small file is the file itself, share the string with hash.
+        if len(blocks) == 1 and blocks[0] == hash_:
+            blocks[0] = hash_
         return cls(algorithm, hash_, blocksize, blocks)
 
     @override
@@ -2,6 +2,7 @@
 
 from abc import ABC
 from abc import abstractmethod
+from collections.abc import Iterable
 from asar.integrity.base import IntegrityInfo
 
 
@@ -9,14 +10,56 @@ class IntegrityChecker(ABC):
     """Abstract class defines functions required by valid checkers."""
 
     @abstractmethod
-    def check(self, data: bytes, info: IntegrityInfo) -> bool:
+    def check(self, data: bytes | memoryview, info: IntegrityInfo) -> bool:
         """Check if data is valid.
 
         Args:
-           data(bytes): The data to check.
+           data(bytes | memoryview): The data to check.
            info(IntegrityInfo): The integrity info.
 
         Returns:
             bool: If data is valid.
         """
         raise NotImplementedError
+
+    def check_block(self, data: bytes | memoryview, info: IntegrityInfo, index: int) -> bool:
+        """Check if a block of data is valid, without hashing other blocks.
+
+        Args:
+            data(bytes | memoryview): The content of the block.
+            info(IntegrityInfo): The integrity info of the whole data.
+            index(int): The index of the block.
+
+        Returns:
+            bool: If the block is valid.
+        """
+        return index < len(info.blocks) and self.hexdigest(data) == info.blocks[index]
+
+    @abstractmethod
+    def hexdigest(self, data: bytes | memoryview) -> str:
+        """Get checksum of data.
+
+        Args:
+            data(bytes | memoryview): The data to hash.
+
+        Returns:
+            str: The checksum in hex format.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def generate(
+        self,
+        data: Iterable[bytes | memoryview],
+        blocksize: int,
+    ) -> IntegrityInfo:
+        """Generate integrity info of data.
+
+        Args:
+            data(Iterable[bytes | memoryview]): Chunks of the data, which is read only once.
+            blocksize(int): The size of each block.
+
+        Returns:
+            IntegrityInfo: The integrity info.
+        """
+        raise NotImplementedError
@@ -0,0 +1,25 @@
+"""Look up integrity checkers by the algorithm named in json header."""
+
+from asar.integrity.base import AlgorithmType
+from asar.integrity.sha256 import Sha256Checker
+from asar.integrity.checker import IntegrityChecker
+
+
+_CHECKERS: dict[AlgorithmType, IntegrityChecker] = {
+    "SHA256": Sha256Checker(),
+}
+
+
+def get_checker(algorithm: AlgorithmType) -> IntegrityChecker:
+    """Get the checker of an algorithm.
+
+    Args:
+        algorithm(AlgorithmType): The checksum algorithm.
+
+    Returns:
+        IntegrityChecker: The checker, which is shared and stateless.
+
+    Raises:
+        KeyError: If the algorithm is unknown.
+    """
+    return _CHECKERS[algorithm]
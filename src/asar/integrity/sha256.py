@@ -3,6 +3,7 @@
 import hashlib
 import logging
 from typing import override
+from collections.abc import Iterable
 from asar.integrity.base import IntegrityInfo
 from asar.integrity.checker import IntegrityChecker
 
@@ -14,19 +15,49 @@ class Sha256Checker(IntegrityChecker):
     """Check if data matches sha256 checksum."""
 
     @override
-    def check(self, data: bytes, info: IntegrityInfo) -> bool:
-        cipher = hashlib.sha256(data)
-        if cipher.hexdigest() != info.hash_:
+    def check(self, data: bytes | memoryview, info: IntegrityInfo) -> bool:
+        hexdigest = self.hexdigest(data)
+        if hexdigest != info.hash_:
             _logger.error("Hash mismatch!")
-            _logger.info("Got %s, wants %s.", cipher.hexdigest(), info.hash_)
+            _logger.info("Got %s, wants %s.", hexdigest, info.hash_)
             return False
         blocks = [
             data[i : i + info.blocksize] for i in range(0, len(data), info.blocksize)
         ]
         for i in range(len(blocks)):
-            cipher = hashlib.sha256(blocks[i])
-            if len(info.blocks) < i or cipher.hexdigest() != info.blocks[i]:
-                _logger.error("Block %s hash mismatch!")
-                _logger.info("Got %s, wants %s.", cipher.hexdigest(), info.blocks[i])
+            hexdigest = self.hexdigest(blocks[i])
+            if len(info.blocks) <= i or hexdigest != info.blocks[i]:
+                _logger.error("Block %s hash mismatch!", i)
+                _logger.info("Got %s, wants %s.", hexdigest, info.blocks[i : i + 1])
                 return False
         return True
+
+    @override
+    def hexdigest(self, data: bytes | memoryview) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    @override
+    def generate(
+        self,
+        data: Iterable[bytes | memoryview],
+        blocksize: int,
+    ) -> IntegrityInfo:
+        cipher = hashlib.sha256()
+        block_cipher = hashlib.sha256()
+        block_filled = 0
+        blocks: list[str] = []
+        for chunk in data:
+            cipher.update(chunk)
+            view = memoryview(chunk)
+            while len(view) > 0:
+                part = view[: blocksize - block_filled]
+                block_cipher.update(part)
+                block_filled += len(part)
+                view = view[len(part) :]
+                if block_filled == blocksize:
+                    blocks.append(block_cipher.hexdigest())
+                    block_cipher = hashlib.sha256()
+                    block_filled = 0
+        # @electron/asar always hashes the last block, even if it is empty.
+        blocks.append(block_cipher.hexdigest())
+        return IntegrityInfo("SHA256", cipher.hexdigest(), blocksize, blocks)
@@ -0,0 +1,79 @@
+"""Verify integrity of many files in parallel."""
+
+import os
+import logging
+from pathlib import PurePath
+from dataclasses import dataclass
+from asar.file.base import AsarFile
+from collections.abc import Mapping
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from asar.integrity.registry import get_checker
+
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IntegrityMismatch:
+    """Dataclass to describe a checksum mismatch of a file or one of its blocks."""
+
+    path: PurePath
+    block: int | None
+    expected: str
+    actual: str
+
+
+class IntegrityVerifier:
+    """Verify files by hashing each file and each of its blocks in a thread pool.
+
+    hashlib releases the GIL when hashing large buffers, so hashing runs on all workers.
+    """
+
+    def __init__(self, workers: int | None = None):
+        """Initialize verifier.
+
+        Args:
+            workers(int | None): The count of threads. Count of cpus is used if it is None.
+        """
+        self.workers = workers or os.cpu_count() or 1
+
+    def verify(self, files: Mapping[PurePath, AsarFile]) -> list[IntegrityMismatch]:
+        """Verify all files given.
+
+        Args:
+            files(Mapping[PurePath, AsarFile]): The files to verify, like an Asar instance.
+
+        Returns:
+            list[IntegrityMismatch]: All mismatches found, which is empty if all files are valid.
+        """
+        _logger.debug("Verifying %s files with %s workers...", len(files), self.workers)
+        tasks: list[tuple[PurePath, int | None, str, Future[str]]] = []
+        with ThreadPoolExecutor(self.workers) as executor:
+            for path, f in files.items():
+                integrity = f.meta.integrity
+                checker = get_checker(integrity.algorithm)
+                view = memoryview(f.content)
+                whole = executor.submit(checker.hexdigest, view)
+                tasks.append((path, None, integrity.hash_, whole))
+                starts = range(0, len(view), integrity.blocksize)
+                for i, start in enumerate(starts):
+                    expected = integrity.blocks[i] if i < len(integrity.blocks) else ""
+                    # The only block of a small file is the file itself.
+                    block = (
+                        whole
+                        if len(starts) == 1
+                        else executor.submit(
+                            checker.hexdigest,
+                            view[start : start + integrity.blocksize],
+                        )
+                    )
+                    tasks.append((path, i, expected, block))
+            mismatches = [
+                IntegrityMismatch(path, i, expected, future.result())
+                for path, i, expected, future in tasks
+                if future.result() != expected
+            ]
+        for mismatch in mismatches:
+            _logger.error("Checksum mismatch: %s", mismatch)
+        return mismatches
@@ -0,0 +1,57 @@
+"""Decide the order of content of files in archive."""
+
+import logging
+from pathlib import PurePath
+from collections.abc import Iterable
+
+
+_logger = logging.getLogger(__name__)
+
+
+def _to_path(line: str) -> PurePath | None:
+    line = line.strip()
+    if len(line) == 0 or line.startswith("#"):
+        return None
+    path = PurePath(line)
+    return path.relative_to("/") if path.is_absolute() else path
+
+
+def parse_ordering(lines: Iterable[str]) -> list[PurePath]:
+    """Parse an ordering file used by @electron/asar.
+
+    Each line is a path to a file, which may be prefixed by a key and ":".
+
+    Args:
+        lines(Iterable[str]): Lines of the ordering file.
+
+    Returns:
+        list[PurePath]: Paths of files in the order to place their content.
+    """
+    paths: list[PurePath] = []
+    for line in lines:
+        path = _to_path(line.rsplit(":", 1)[-1])
+        if path is not None:
+            paths.append(path)
+    return paths
+
+
+def ordering_from_trace(lines: Iterable[str]) -> list[PurePath]:
+    """Generate ordering from a trace of accesses, like files read when an app starts.
+
+    Files are placed in the order they are accessed for the first time, so files read together
+    are contiguous in archive.
+
+    Args:
+        lines(Iterable[str]): Lines of the trace, each one is a path accessed.
+            Empty lines and lines starting with "#" are ignored.
+
+    Returns:
+        list[PurePath]: Paths of files in the order to place their content.
+    """
+    paths: dict[PurePath, None] = {}
+    for line in lines:
+        path = _to_path(line)
+        if path is not None:
+            paths.setdefault(path)
+    _logger.debug("Got %s files from trace.", len(paths))
+    return list(paths)
@@ -0,0 +1,141 @@
+"""Directory tree index of files in archive."""
+
+from typing import Generic
+from typing import TypeVar
+from typing import TypeGuard
+from pathlib import PurePath
+from collections.abc import Iterator
+
+
+_T = TypeVar("_T")
+
+
+class FolderNode(Generic[_T]):
+    """A folder in the tree with its direct children."""
+
+    __slots__ = ("children",)
+
+    def __init__(self):
+        """Initialize an empty folder."""
+        self.children: dict[str, FolderNode[_T] | _T] = {}
+
+
+# isinstance alone narrows a child to FolderNode of unknown type, as _T may be a FolderNode.
+def _is_folder(node: FolderNode[_T] | _T | None) -> TypeGuard[FolderNode[_T]]:
+    return isinstance(node, FolderNode)
+
+
+class FileTree(Generic[_T]):
+    """Files indexed by their folders, so paths can be looked up and walked without scanning."""
+
+    def __init__(self):
+        """Initialize an empty tree."""
+        self.root: FolderNode[_T] = FolderNode[_T]()
+        self._index: tuple[list[PurePath], list[PurePath], list[_T]] | None = None
+
+    @property
+    def files(self) -> list[PurePath]:
+        """Sorted paths of files, which are cached until the tree is changed."""
+        return self._get_index()[0]
+
+    @property
+    def folders(self) -> list[PurePath]:
+        """Sorted paths of folders, which are cached until the tree is changed."""
+        return self._get_index()[1]
+
+    @property
+    def values(self) -> list[_T]:
+        """Files in the order of their paths, which are cached until the tree is changed."""
+        return self._get_index()[2]
+
+    def add(self, path: PurePath, file: _T):
+        """Add a file to the tree, folders are created if they do not exist.
+
+        Args:
+            path(PurePath): The relative path to the file.
+            file(_T): The file.
+
+        Raises:
+            ValueError: If any parent of the path is a file, or the path is a folder.
+        """
+        folder = self.root
+        for name in path.parent.parts:
+            child = folder.children.setdefault(name, FolderNode[_T]())
+            if not _is_folder(child):
+                raise ValueError("Parent is a file.", path)
+            folder = child
+        if _is_folder(folder.children.get(path.name)):
+            raise ValueError("Path is a folder.", path)
+        folder.children[path.name] = file
+        self._index = None
+
+    def remove(self, path: PurePath):
+        """Remove a file from the tree, folders which become empty are removed too.
+
+        Args:
+            path(PurePath): The relative path to the file.
+
+        Raises:
+            KeyError: If the file does not exist.
+        """
+        folders = [self.root]
+        for name in path.parent.parts:
+            child = folders[-1].children.get(name)
+            if not _is_folder(child):
+                raise KeyError(path)
+            folders.append(child)
+        child = folders[-1].children.get(path.name)
+        if child is None or _is_folder(child):
+            raise KeyError(path)
+        del folders[-1].children[path.name]
+        self._index = None
+        # folders[depth] is named path.parent.parts[depth - 1] in folders[depth - 1].
+        for depth in range(len(folders) - 1, 0, -1):
+            if len(folders[depth].children) > 0:
+                break
+            del folders[depth - 1].children[path.parent.parts[depth - 1]]
+
+    def invalidate(self):
+        """Drop cached paths, which must be called after nodes are changed directly."""
+        self._index = None
+
+    def clear(self):
+        """Remove all files."""
+        self.root = FolderNode[_T]()
+        self._index = None
+
+    def walk(self) -> Iterator[tuple[PurePath, _T | None]]:
+        """Walk the tree in the order of paths, folders are followed by their content.
+
+        Yields:
+            tuple[PurePath, _T | None]: The path of each entry and the file, which is None for
+                folders.
+        """
+        yield from self._walk_recursively(self.root, PurePath())
+
+    def _get_index(self) -> tuple[list[PurePath], list[PurePath], list[_T]]:
+        if self._index is None:
+            files: list[PurePath] = []
+            folders: list[PurePath] = []
+            values: list[_T] = []
+            for path, file in self.walk():
+                if file is None:
+                    folders.append(path)
+                else:
+                    files.append(path)
+                    values.append(file)
+            self._index = files, folders, values
+        return self._index
+
+    def _walk_recursively(
+        self,
+        folder: FolderNode[_T],
+        parent: PurePath,
+    ) -> Iterator[tuple[PurePath, _T | None]]:
+        for name in sorted(folder.children):
+            child = folder.children[name]
+            if _is_folder(child):
+                yield parent / name, None
+                yield from self._walk_recursively(child, parent / name)
+            elif not isinstance(child, FolderNode):
+                yield parent / name, child
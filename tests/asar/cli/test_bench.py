@@ -0,0 +1,22 @@
+"""Test ./src/asar/cli/bench.py functions."""
+
+import pytest
+from asar.cli.bench import SHAPES
+from asar.cli.bench import bench as _bench
+from asar.cli.bench import run_benchmarks as _run_benchmarks
+
+
+def test_run_benchmarks():
+    """Test run_benchmarks function."""
+    results = _run_benchmarks(SHAPES, 0.001)
+    assert {r.shape for r in results} == set(SHAPES)
+    for result in results:
+        assert result.seconds >= 0
+        assert result.entries > 0
+        assert result.throughput > 0
+
+
+def test_bench(capsys: pytest.CaptureFixture[str]):
+    """Test bench function."""
+    _bench(["tiny"], 0.001)
+    assert "parse" in capsys.readouterr().out
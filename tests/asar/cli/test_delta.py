@@ -0,0 +1,46 @@
+"""Test ./src/asar/cli/delta.py functions."""
+
+import os
+import pytest
+from asar import Asar
+from pathlib import Path
+from pathlib import PurePath
+from asar.cli.delta import apply as _apply
+from asar.cli.delta import delta as _delta
+from asar.file.base import AsarFile
+from asar.integrity.base import ChecksumMismatchError
+
+
+def test_delta(tmp_path: Path):
+    """Test delta and apply functions."""
+    blocksize = 1024
+    content = os.urandom(blocksize * 8)
+    old = Asar()
+    old[PurePath("big.bin")] = AsarFile.from_content(content)
+    old[PurePath("lib/index.js")] = AsarFile.from_content(os.urandom(blocksize))
+    new = Asar()
+    changed = content[: blocksize * 3] + os.urandom(blocksize) + content[blocksize * 4 :]
+    new[PurePath("big.bin")] = AsarFile.from_content(changed)
+    new[PurePath("moved/index.js")] = AsarFile.from_content(old[PurePath("lib/index.js")].content)
+    new[PurePath("added.js")] = AsarFile.from_content(os.urandom(42))
+    for asar in (old, new):
+        asar[PurePath("big.bin")].meta.integrity.blocksize = blocksize
+    _ = (tmp_path / "old.asar").write_bytes(bytes(old))
+    _ = (tmp_path / "new.asar").write_bytes(bytes(new))
+    _delta(tmp_path / "old.asar", tmp_path / "new.asar", tmp_path / "patch")
+    assert (tmp_path / "patch").stat().st_size < (tmp_path / "new.asar").stat().st_size // 3
+    _apply(tmp_path / "old.asar", tmp_path / "patch", tmp_path / "built.asar")
+    assert (tmp_path / "built.asar").read_bytes() == (tmp_path / "new.asar").read_bytes()
+
+
+def test_apply_mismatch(tmp_path: Path):
+    """Test apply function with another old archive."""
+    old = Asar()
+    old[PurePath("test.bin")] = AsarFile.from_content(os.urandom(42))
+    _ = (tmp_path / "old.asar").write_bytes(bytes(old))
+    _delta(tmp_path / "old.asar", tmp_path / "old.asar", tmp_path / "patch")
+    old[PurePath("test.bin")] = AsarFile.from_content(os.urandom(42))
+    _ = (tmp_path / "old.asar").write_bytes(bytes(old))
+    with pytest.raises(ChecksumMismatchError):
+        _apply(tmp_path / "old.asar", tmp_path / "patch", tmp_path / "built.asar")
+    assert not (tmp_path / "built.asar").exists()
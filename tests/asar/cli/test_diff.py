@@ -0,0 +1,43 @@
+"""Test ./src/asar/cli/diff.py functions."""
+
+import os
+import json
+import pytest
+from asar import Asar
+from pathlib import Path
+from pathlib import PurePath
+from asar.cli.diff import diff as _diff
+from asar.file.base import AsarFile
+
+
+def test_diff(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """Test diff function."""
+    blocksize = 16
+    old = Asar()
+    new = Asar()
+    content = os.urandom(blocksize * 3)
+    for asar in (old, new):
+        asar[PurePath("same.js")] = AsarFile.from_content(b"same")
+    old[PurePath("removed.js")] = AsarFile.from_content(b"removed")
+    new[PurePath("added.js")] = AsarFile.from_content(b"added")
+    old[PurePath("big.bin")] = AsarFile.from_content(content)
+    changed = content[:blocksize] + os.urandom(blocksize) + content[blocksize * 2 :]
+    new[PurePath("big.bin")] = AsarFile.from_content(changed)
+    for asar in (old, new):
+        asar[PurePath("big.bin")].meta.integrity.blocksize = blocksize
+    _ = (tmp_path / "old.asar").write_bytes(bytes(old))
+    _ = (tmp_path / "new.asar").write_bytes(bytes(new))
+    _diff(tmp_path / "old.asar", tmp_path / "new.asar", blocks=True, json_=True)
+    entries = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert entries == [
+        {"path": "/added.js", "status": "added"},
+        {"path": "/big.bin", "status": "modified", "blocks": [1]},
+        {"path": "/removed.js", "status": "removed"},
+    ]
+    _diff(tmp_path / "old.asar", tmp_path / "new.asar", unchanged=True)
+    assert capsys.readouterr().out.splitlines() == [
+        "A /added.js",
+        "M /big.bin",
+        "D /removed.js",
+        "  /same.js",
+    ]
@@ -1,10 +1,13 @@
 """Test ./src/asar/cli/extract.py functions."""
 
 import os
+import pytest
 from pathlib import Path
 from pathlib import PurePath
+from asar.cli.pack import pack as _pack
 from asar.cli.extract import extract as _extract
 from asar.cli.extract import extract_file as _extract_file
+from asar.integrity.base import ChecksumMismatchError
 
 
 def test_extract_file(asar_path: Path):
@@ -22,3 +25,35 @@ def test_extract(asar_path: Path):
     _extract(asar_path, dest)
     assert dest.is_dir()
     assert (dest / "test.bin").exists()
+
+
+def test_extract_parallel(tmp_path: Path):
+    """Test extract function."""
+    source = tmp_path / "test"
+    for i in range(10):
+        (source / str(i) / "sub").mkdir(parents=True)
+        _ = (source / str(i) / "sub" / "test.bin").write_bytes(os.urandom(i))
+    (source / "0" / "sub" / "test.bin").chmod(0o755)
+    _pack(source, tmp_path / "test.asar", None, None, None, False)
+    dest = tmp_path / "test_extracted"
+    _extract(tmp_path / "test.asar", dest, 4)
+    for i in range(10):
+        target = dest / str(i) / "sub" / "test.bin"
+        assert target.read_bytes() == (source / str(i) / "sub" / "test.bin").read_bytes()
+    assert os.access(dest / "0" / "sub" / "test.bin", os.R_OK | os.X_OK)
+
+
+def test_extract_invalid(tmp_path: Path):
+    """Test extracting a corrupted archive raises ChecksumMismatchError."""
+    source = tmp_path / "test"
+    source.mkdir()
+    _ = (source / "test.bin").write_bytes(os.urandom(42))
+    _pack(source, tmp_path / "test.asar", None, None, None, False)
+    raw = bytearray((tmp_path / "test.asar").read_bytes())
+    raw[-1] ^= 1
+    _ = (tmp_path / "test.asar").write_bytes(raw)
+    with pytest.raises(ChecksumMismatchError):
+        _extract(tmp_path / "test.asar", tmp_path / "test_extracted")
+    os.chdir(tmp_path)
+    with pytest.raises(ChecksumMismatchError):
+        _extract_file(tmp_path / "test.asar", PurePath("/test.bin"))
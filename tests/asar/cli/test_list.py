@@ -1,10 +1,34 @@
 """Test ./src/asar/cli/list.py functions."""
 
+import json
+import pytest
 from pathlib import Path
 from asar.cli.list import list_archive as _list_archive
+from asar.cli.pack import pack as _pack
 
 
 def test_list_archive(asar_path: Path):
     """Test list_archive function."""
     _list_archive(asar_path, False)
     _list_archive(asar_path, True)
+
+
+def test_list_archive_order(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    """Test list_archive function."""
+    source = tmp_path / "test"
+    (source / "a" / "b").mkdir(parents=True)
+    _ = (source / "a" / "b" / "c").write_bytes(b"c")
+    _ = (source / "a-b").write_bytes(b"a-b")
+    _pack(source, tmp_path / "test.asar", None, None, None, False)
+    _ = capsys.readouterr()
+    _list_archive(tmp_path / "test.asar", False, True, True)
+    assert capsys.readouterr().out.splitlines() == [
+        "- - /a",
+        "- - /a/b",
+        "1 0 /a/b/c",
+        "3 1 /a-b",
+    ]
+    _list_archive(tmp_path / "test.asar", False, json_=True)
+    entries = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [e["path"] for e in entries] == ["/a", "/a/b", "/a/b/c", "/a-b"]
+    assert entries[-1]["size"] == len(b"a-b")
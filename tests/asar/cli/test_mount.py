@@ -0,0 +1,75 @@
+"""Test ./src/asar/cli/mount.py functions."""
+
+import os
+import stat
+import errno
+import pytest
+from asar import Asar
+from asar.fs import ContentCache
+from pathlib import Path
+from pathlib import PurePath
+from asar.cli.mount import MountHandler
+from asar.file.base import AsarFile
+
+
+def test_handler(tmp_path: Path):
+    """Test MountHandler operations."""
+    executable_mode = 0o555
+    readonly_mode = 0o444
+    asar = Asar()
+    asar[PurePath("lib/index.js")] = AsarFile.from_content(os.urandom(42))
+    asar[PurePath("run.sh")] = AsarFile.from_content(os.urandom(42), executable=True)
+    compressed = b"module.exports = 42;\n" * 1024
+    asar[PurePath("lib/data.js")] = AsarFile.from_content(compressed, codec="zlib")
+    _ = (tmp_path / "test.asar").write_bytes(bytes(asar))
+    handler = MountHandler(tmp_path / "test.asar")
+    try:
+        assert handler("readdir", "/", None) == [".", "..", "lib", "run.sh"]
+        assert handler.readdir("/lib") == [".", "..", "data.js", "index.js"]
+        assert stat.S_ISDIR(int(handler.getattr("/lib")["st_mode"]))
+        attrs = handler.getattr("/run.sh")
+        assert stat.S_IMODE(int(attrs["st_mode"])) == executable_mode
+        assert attrs["st_size"] == asar[PurePath("run.sh")].size
+        assert stat.S_IMODE(int(handler.getattr("/lib/index.js")["st_mode"])) == readonly_mode
+        assert handler.open("/lib/index.js", os.O_RDONLY) == 0
+        content = asar[PurePath("lib/index.js")].content
+        assert handler.read("/lib/index.js", 8, 2) == content[2:10]
+        assert handler.read("/lib/index.js", 4096, 40) == content[40:]
+        assert handler.getattr("/lib/data.js")["st_size"] == len(compressed)
+        assert handler.read("/lib/data.js", 4096, 20000) == compressed[20000:24096]
+        with pytest.raises(OSError, match="No such file") as e:
+            _ = handler.getattr("/missing")
+        assert e.value.errno == errno.ENOENT
+        with pytest.raises(OSError, match="Read-only") as e:
+            _ = handler.open("/run.sh", os.O_WRONLY)
+        with pytest.raises(OSError, match="Function not implemented"):
+            _ = handler("write", "/run.sh", b"", 0, None)
+    finally:
+        handler.destroy("/")
+
+
+def test_handler_compressed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test MountHandler reads compressed files in ranges through cache or stream."""
+    max_size = 40000
+    asar = Asar()
+    contents = {
+        "small.js": b"module.exports = 1;\n" * 1024,
+        "large.js": b"module.exports = 2;\n" * 4096,
+        "other.js": b"module.exports = 3;\n" * 4096,
+    }
+    for name, content in contents.items():
+        asar[PurePath(name)] = AsarFile.from_content(content, codec="lzma")
+    _ = (tmp_path / "test.asar").write_bytes(bytes(asar))
+    handler = MountHandler(tmp_path / "test.asar", ContentCache(max_size))
+    try:
+        size = 4096
+        # Only the first read of large files creates their streams, as they are read forward.
+        for offset in range(0, len(contents["large.js"]) + size, size):
+            for name, content in contents.items():
+                assert handler.read(f"/{name}", size, offset) == content[offset : offset + size]
+            monkeypatch.setattr(MountHandler, "_iter_decompressed", None)
+        monkeypatch.undo()
+        assert len(handler.cache) == 1
+        assert handler.read("/large.js", size, 100) == contents["large.js"][100 : 100 + size]
+    finally:
+        handler.destroy("/")
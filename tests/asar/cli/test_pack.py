@@ -1,11 +1,202 @@
 """Test ./src/asar/cli/pack.py functions."""
 
+import os
 import pytest
+import logging
+from asar import Asar
 from pathlib import Path
+from pathlib import PurePath
 from asar.cli.pack import pack as _pack
+from asar.file.base import DiskAsarFile
+from asar.cli.extract import extract as _extract
 
 
 def test_pack(tmp_path: Path):
     """Test pack function."""
-    with pytest.raises(NotImplementedError):
-        _pack(tmp_path / "test", tmp_path / "test.asar", None, None, None, False)
+    source = tmp_path / "test"
+    (source / "dir").mkdir(parents=True)
+    _ = (source / "test.bin").write_bytes(os.urandom(42))
+    _ = (source / "dir" / "empty.bin").write_bytes(b"")
+    _ = (source / ".hidden").write_bytes(os.urandom(42))
+    _pack(source, tmp_path / "test.asar", None, None, None, True)
+    with Asar.open(tmp_path / "test.asar") as asar:
+        assert asar.files == [PurePath("dir/empty.bin"), PurePath("test.bin")]
+        for path, f in asar.items():
+            assert f.content == (source / path).read_bytes()
+            assert f.check()
+
+
+def test_pack_ordering(tmp_path: Path):
+    """Test pack function with ordering and trace."""
+    source = tmp_path / "test"
+    (source / "lib").mkdir(parents=True)
+    for name in ("a.js", "b.js", "c.js", "lib/d.js"):
+        _ = (source / name).write_bytes(os.urandom(42))
+    ordering = tmp_path / "ordering.txt"
+    _ = ordering.write_text("c.js\n/lib/d.js\n", encoding="utf-8")
+    trace = tmp_path / "trace.txt"
+    _ = trace.write_text("b.js\nc.js\nb.js\n", encoding="utf-8")
+    _pack(source, tmp_path / "test.asar", ordering, None, None, False, False, trace)
+    with Asar.open(tmp_path / "test.asar") as asar:
+        assert asar.files == [
+            PurePath("a.js"),
+            PurePath("b.js"),
+            PurePath("c.js"),
+            PurePath("lib/d.js"),
+        ]
+        layout = sorted(asar, key=lambda path: int(asar[path].meta.offset or 0))
+        assert layout == [
+            PurePath("c.js"),
+            PurePath("lib/d.js"),
+            PurePath("b.js"),
+            PurePath("a.js"),
+        ]
+        for path, f in asar.items():
+            assert f.content == (source / path).read_bytes()
+
+
+def test_pack_unpacked(tmp_path: Path):
+    """Test pack function with unpacked files."""
+    source = tmp_path / "test"
+    (source / "lib").mkdir(parents=True)
+    _ = (source / "addon.node").write_bytes(os.urandom(42))
+    _ = (source / "lib" / "index.js").write_bytes(os.urandom(42))
+    _ = (source / "main.js").write_bytes(os.urandom(42))
+    _pack(source, tmp_path / "test.asar", None, "*.node", "lib", False)
+    unpacked = tmp_path / "test.asar.unpacked"
+    assert (unpacked / "addon.node").read_bytes() == (source / "addon.node").read_bytes()
+    index = PurePath("lib/index.js")
+    assert (unpacked / index).read_bytes() == (source / index).read_bytes()
+    assert not (unpacked / "main.js").exists()
+    with Asar.open(tmp_path / "test.asar") as asar:
+        assert asar[PurePath("addon.node")].meta.unpacked
+        assert not asar[PurePath("main.js")].meta.unpacked
+        for path, f in asar.items():
+            assert f.content == (source / path).read_bytes()
+            assert f.check()
+
+
+def test_pack_dedupe(tmp_path: Path):
+    """Test pack function with dedupe."""
+    source = tmp_path / "test"
+    source.mkdir()
+    content = os.urandom(42)
+    _ = (source / "a.txt").write_bytes(content)
+    _ = (source / "b.txt").write_bytes(content)
+    _pack(source, tmp_path / "test.asar", None, None, None, False, True)
+    with Asar.open(tmp_path / "test.asar") as asar:
+        assert asar[PurePath("a.txt")].meta.offset == asar[PurePath("b.txt")].meta.offset
+        assert asar[PurePath("b.txt")].content == content
+        assert asar[PurePath("b.txt")].check()
+
+
+def test_pack_jobs(tmp_path: Path):
+    """Test pack function with many threads is deterministic."""
+    source = tmp_path / "test"
+    (source / ".git").mkdir(parents=True)
+    _ = (source / ".git" / "HEAD").write_bytes(os.urandom(42))
+    for i in range(32):
+        (source / f"{i % 4}").mkdir(exist_ok=True)
+        _ = (source / f"{i % 4}" / f"{i}.js").write_bytes(os.urandom(i))
+    _pack(source, tmp_path / "1.asar", None, None, None, True, jobs=1)
+    _pack(source, tmp_path / "2.asar", None, None, None, True, jobs=8)
+    assert (tmp_path / "1.asar").read_bytes() == (tmp_path / "2.asar").read_bytes()
+    with Asar.open(tmp_path / "2.asar") as asar:
+        assert PurePath(".git/HEAD") not in asar
+        assert all(f.check() for f in asar.values())
+
+
+def test_pack_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test pack function reads each file only once to hash and write it."""
+    source = tmp_path / "test"
+    source.mkdir()
+    for i in range(8):
+        _ = (source / f"{i}.bin").write_bytes(os.urandom(i * 1024))
+    reads: list[Path] = []
+    read_bytes = Path.read_bytes
+
+    def _read_bytes(self: Path) -> bytes:
+        reads.append(self)
+        return read_bytes(self)
+
+    monkeypatch.setattr(Path, "read_bytes", _read_bytes)
+    monkeypatch.setattr(DiskAsarFile, "iter_content", None)
+    _pack(source, tmp_path / "test.asar", None, None, None, False, jobs=4)
+    assert sorted(reads) == sorted(source.iterdir())
+    monkeypatch.undo()
+    with Asar.open(tmp_path / "test.asar") as asar:
+        assert all(f.check() for f in asar.values())
+        assert asar[PurePath("7.bin")].content == (source / "7.bin").read_bytes()
+
+
+def test_pack_symlink(tmp_path: Path, caplog: pytest.LogCaptureFixture):
+    """Test pack function follows symlinks and skips dangling or looping ones."""
+    source = tmp_path / "test"
+    (source / "lib").mkdir(parents=True)
+    content = os.urandom(42)
+    _ = (source / "lib" / "index.js").write_bytes(content)
+    (source / "linked").symlink_to(source / "lib")
+    (source / "main.js").symlink_to(source / "lib" / "index.js")
+    (source / "missing.js").symlink_to(source / "nothing.js")
+    (source / "lib" / "loop").symlink_to(source)
+    with caplog.at_level(logging.WARNING):
+        _pack(source, tmp_path / "test.asar", None, None, None, False)
+    assert "missing.js" in caplog.text
+    assert "loop" in caplog.text
+    with Asar.open(tmp_path / "test.asar") as asar:
+        assert asar.files == [
+            PurePath("lib/index.js"),
+            PurePath("linked/index.js"),
+            PurePath("main.js"),
+        ]
+        assert all(f.content == content for f in asar.values())
+        assert all(f.check() for f in asar.values())
+
+
+def test_pack_compress(tmp_path: Path):
+    """Test pack function with a codec."""
+    source = tmp_path / "test"
+    source.mkdir()
+    _ = (source / "index.js").write_bytes(b"module.exports = 42;\n" * 1024)
+    _ = (source / "random.bin").write_bytes(os.urandom(42))
+    _ = (source / "addon.node").write_bytes(b"\0" * 1024)
+    _pack(source, tmp_path / "test.asar", None, "*.node", None, False, codec="lzma")
+    # Temporary files of compressed content are removed.
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "test",
+        "test.asar",
+        "test.asar.unpacked",
+    ]
+    with Asar.open(tmp_path / "test.asar") as asar:
+        assert asar[PurePath("index.js")].meta.codec == "lzma"
+        assert asar[PurePath("random.bin")].meta.codec is None
+        assert asar[PurePath("addon.node")].meta.codec is None
+        for path in asar:
+            assert asar.read(path) == (source / path).read_bytes()
+    _extract(tmp_path / "test.asar", tmp_path / "dest")
+    for name in ("index.js", "random.bin", "addon.node"):
+        assert (tmp_path / "dest" / name).read_bytes() == (source / name).read_bytes()
+
+
+def test_pack_unpack_glob(tmp_path: Path):
+    """Test pack function with globs matching paths segment by segment."""
+    source = tmp_path / "test"
+    (source / "lib" / "x").mkdir(parents=True)
+    for name in ("a.node", "e.js", "lib/b.node", "lib/d.js", "lib/x/c.node"):
+        _ = (source / name).write_bytes(os.urandom(42))
+    _pack(source, tmp_path / "all.asar", None, "lib/**/*.{node,js}", None, False)
+    with Asar.open(tmp_path / "all.asar") as asar:
+        unpacked = [path.as_posix() for path, f in asar.items() if f.meta.unpacked]
+    assert unpacked == ["lib/b.node", "lib/d.js", "lib/x/c.node"]
+    _pack(source, tmp_path / "lib.asar", None, "lib/*.node", None, False)
+    with Asar.open(tmp_path / "lib.asar") as asar:
+        unpacked = [path.as_posix() for path, f in asar.items() if f.meta.unpacked]
+    assert unpacked == ["lib/b.node"]
+    _pack(source, tmp_path / "dir.asar", None, "lib/**", None, False)
+    with Asar.open(tmp_path / "dir.asar") as asar:
+        unpacked = [path.as_posix() for path, f in asar.items() if f.meta.unpacked]
+    assert unpacked == ["lib/b.node", "lib/d.js", "lib/x/c.node"]
+    _pack(source, tmp_path / "sub.asar", None, "lib/x/**", None, False)
+    with Asar.open(tmp_path / "sub.asar") as asar:
+        unpacked = [path.as_posix() for path, f in asar.items() if f.meta.unpacked]
+    assert unpacked == ["lib/x/c.node"]
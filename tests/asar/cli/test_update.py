@@ -0,0 +1,117 @@
+"""Test ./src/asar/cli/update.py functions."""
+
+import os
+import pytest
+import shutil
+from asar import Asar
+from pathlib import Path
+from pathlib import PurePath
+from asar.header import DEFAULT_SLACK
+from asar.cli.pack import pack as _pack
+from asar.file.base import AsarFile
+from asar.cli.update import update as _update
+from asar.cli.update import compact as _compact
+
+
+def test_update(tmp_path: Path):
+    """Test update and compact functions."""
+    archive = tmp_path / "test.asar"
+    asar = Asar()
+    asar[PurePath("config.json")] = AsarFile.from_content(os.urandom(42))
+    asar[PurePath("main.js")] = AsarFile.from_content(os.urandom(42))
+    with archive.open("wb") as f:
+        asar.write(f, slack=DEFAULT_SLACK)
+    size = archive.stat().st_size
+    new = tmp_path / "config.json"
+    _ = new.write_bytes(os.urandom(42))
+    _update(archive, PurePath("config.json"), new)
+    _update(archive, PurePath("/lib/config.json"), new)
+    _update(archive, PurePath("config.json"), new)
+    # Header is written with padding, so only content is appended.
+    assert archive.stat().st_size == size + len(new.read_bytes()) * 3
+    with Asar.open(archive) as updated:
+        assert updated.files == [
+            PurePath("config.json"),
+            PurePath("lib/config.json"),
+            PurePath("main.js"),
+        ]
+        assert updated[PurePath("config.json")].content == new.read_bytes()
+        assert updated[PurePath("main.js")].content == asar[PurePath("main.js")].content
+        assert all(f.check() for f in updated.values())
+        files = {path: bytes(f.content) for path, f in updated.items()}
+    _compact(archive)
+    with Asar.open(archive) as compacted:
+        assert {path: bytes(f.content) for path, f in compacted.items()} == files
+    assert archive.stat().st_size < size
+
+
+def test_update_relocate(tmp_path: Path):
+    """Test update relocates content once when header has no padding."""
+    archive = tmp_path / "test.asar"
+    asar = Asar()
+    asar[PurePath("main.js")] = AsarFile.from_content(os.urandom(42))
+    _ = archive.write_bytes(bytes(asar))
+    new = tmp_path / "config.json"
+    _ = new.write_bytes(os.urandom(42))
+    # Header grows past its padding, so content is relocated once with more padding.
+    _update(archive, PurePath("config.json"), new, slack=1024)
+    size = archive.stat().st_size
+    _update(archive, PurePath("lib/config.json"), new)
+    assert archive.stat().st_size == size + len(new.read_bytes())
+    with Asar.open(archive) as updated:
+        assert updated[PurePath("main.js")].content == asar[PurePath("main.js")].content
+        assert updated[PurePath("lib/config.json")].content == new.read_bytes()
+
+
+def test_update_packed(tmp_path: Path):
+    """Test the first update of a packed archive only appends content."""
+    folder = tmp_path / "app"
+    folder.mkdir()
+    _ = (folder / "main.js").write_bytes(os.urandom(42))
+    archive = tmp_path / "test.asar"
+    _pack(folder, archive, None, None, None, exclude_hidden=False)
+    size = archive.stat().st_size
+    new = tmp_path / "config.json"
+    _ = new.write_bytes(os.urandom(42))
+    _update(archive, PurePath("config.json"), new)
+    assert archive.stat().st_size == size + len(new.read_bytes())
+    with Asar.open(archive) as updated:
+        assert updated[PurePath("main.js")].content == (folder / "main.js").read_bytes()
+        assert updated[PurePath("config.json")].content == new.read_bytes()
+
+
+def test_compact_dedupe(tmp_path: Path):
+    """Test compact keeps files sharing content deduplicated."""
+    archive = tmp_path / "test.asar"
+    content = os.urandom(42)
+    asar = Asar()
+    asar[PurePath("a.bin")] = AsarFile.from_content(content)
+    asar[PurePath("b.bin")] = AsarFile.from_content(content)
+    _ = archive.write_bytes(asar.to_bytes(dedupe=True))
+    size = archive.stat().st_size
+    _compact(archive)
+    assert archive.stat().st_size == size
+    with Asar.open(archive) as compacted:
+        assert compacted[PurePath("a.bin")].meta.offset == compacted[PurePath("b.bin")].meta.offset
+
+
+def test_failed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test temporary files are removed when update or compact fails."""
+    archive = tmp_path / "test.asar"
+    asar = Asar()
+    asar[PurePath("main.js")] = AsarFile.from_content(os.urandom(42))
+    _ = archive.write_bytes(bytes(asar))
+    raw = archive.read_bytes()
+    new = tmp_path / "config.json"
+    _ = new.write_bytes(os.urandom(42))
+
+    def _fail(*_: object):
+        raise PermissionError
+
+    monkeypatch.setattr(shutil, "copymode", _fail)
+    with pytest.raises(PermissionError):
+        _update(archive, PurePath("lib/config.json"), new)
+    with pytest.raises(PermissionError):
+        _compact(archive)
+    assert sorted(tmp_path.iterdir()) == [new, archive]
+    assert archive.read_bytes() == raw
@@ -0,0 +1,20 @@
+"""Test ./src/asar/cli/verify.py functions."""
+
+import pytest
+from pathlib import Path
+from asar.cli.verify import verify as _verify
+from asar.integrity.base import ChecksumMismatchError
+
+
+def test_verify(asar_path: Path):
+    """Test verify function."""
+    _verify(asar_path, None)
+
+
+def test_verify_invalid(asar_path: Path):
+    """Test verify function."""
+    content = bytearray(asar_path.read_bytes())
+    content[-1] ^= 0xFF
+    _ = asar_path.write_bytes(content)
+    with pytest.raises(ChecksumMismatchError):
+        _verify(asar_path, 2)
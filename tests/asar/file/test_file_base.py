@@ -1,7 +1,10 @@
 """Test ./src/asar/file/base.py functions."""
 
+import os
 import pytest
+from pathlib import Path
 from asar.file.base import AsarFile
+from asar.file.base import DiskAsarFile
 from asar.file.base import FileMetaInfo
 from asar.file.base import FileMetaDictInfo
 
@@ -49,3 +52,92 @@ class TestAsarFile:
     def test_check_valid(self, random_valid_asar_file: AsarFile):
         """Test AsarFile.check function."""
         assert random_valid_asar_file.check()
+
+    def test_sync_meta(self, random_valid_asar_file: AsarFile):
+        """Test AsarFile.sync_meta function."""
+        integrity = random_valid_asar_file.meta.integrity
+        random_valid_asar_file.sync_meta()
+        assert random_valid_asar_file.meta.integrity is integrity
+        random_valid_asar_file.content = bytes(random_valid_asar_file.content) + b"changed"
+        assert random_valid_asar_file.dirty
+        random_valid_asar_file.sync_meta()
+        assert not random_valid_asar_file.dirty
+        assert random_valid_asar_file.meta.size == len(random_valid_asar_file.content)
+        assert random_valid_asar_file.check()
+
+    def test_from_content(self):
+        """Test AsarFile.from_content function."""
+        f = AsarFile.from_content(os.urandom(42), executable=True)
+        assert f.dirty
+        f.sync_meta()
+        assert f.check()
+        assert f.meta.executable
+
+    def test_from_content_codec(self):
+        """Test AsarFile.from_content function with a codec."""
+        content = b"module.exports = 42;\n" * 1024
+        f = AsarFile.from_content(content, codec="zlib")
+        assert f.meta.codec == "zlib"
+        assert f.size < f.meta.content_size == len(content)
+        assert f.decompress() == content
+        assert f.decompress(1000, 10) == content[1000:1010]
+        meta = FileMetaInfo.from_json(f.meta.to_json())
+        assert (meta.codec, meta.uncompressed_size) == ("zlib", len(content))
+        incompressible = AsarFile.from_content(os.urandom(42), codec="lzma")
+        assert incompressible.meta.codec is None
+        json = f.meta.to_json()
+        json["uncompressedSize"] = True
+        with pytest.raises(ValueError, match="Invalid uncompressedSize"):
+            _ = FileMetaInfo.from_json(json)
+        json["uncompressedSize"] = len(content)
+        del json["codec"]
+        with pytest.raises(ValueError, match="Invalid uncompressedSize without codec"):
+            _ = FileMetaInfo.from_json(json)
+
+    def test_extract(self, tmp_path: Path):
+        """Test AsarFile.extract function."""
+        content = b"module.exports = 42;\n" * 1024
+        AsarFile.from_content(content, executable=True, codec="zlib").extract(tmp_path / "a")
+        assert (tmp_path / "a").read_bytes() == content
+        assert os.access(tmp_path / "a", os.X_OK)
+        AsarFile.from_content(content).extract(tmp_path / "b")
+        assert (tmp_path / "b").read_bytes() == content
+        assert not os.access(tmp_path / "b", os.X_OK)
+
+    def test_iter_content(self, random_valid_asar_file: AsarFile):
+        """Test AsarFile.iter_content function."""
+        content = bytes().join(random_valid_asar_file.iter_content(1024))
+        assert content == random_valid_asar_file.content
+
+
+class TestDiskAsarFile:
+    """Test DiskAsarFile class function."""
+
+    def test_from_path(self, tmp_path: Path):
+        """Test DiskAsarFile.from_path function."""
+        source = tmp_path / "test.bin"
+        size = 42
+        _ = source.write_bytes(os.urandom(size))
+        f = DiskAsarFile.from_path(source)
+        assert f.size == f.meta.size == size
+        assert bytes().join(f.iter_content(5)) == f.content == source.read_bytes()
+        assert f.dirty
+        f.sync_meta()
+        assert not f.dirty
+        assert f.check()
+
+    def test_repr_eq(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test DiskAsarFile never reads content to show or compare it."""
+        source = tmp_path / "test.bin"
+        _ = source.write_bytes(os.urandom(42))
+        f = DiskAsarFile.from_path(source)
+
+        def _read_bytes(_: Path) -> bytes:
+            raise AssertionError
+
+        monkeypatch.setattr(Path, "read_bytes", _read_bytes)
+        assert str(source) in repr(f)
+        assert f == DiskAsarFile.from_path(source)
+        assert f != DiskAsarFile.from_path(source, "SHA256", tmp_path.stat())
+        with pytest.raises(AttributeError):
+            f.content = b""
@@ -1,6 +1,8 @@
 """Test ./src/asar/integrity/base.py functions."""
 
+import os
 import pytest
+from collections import OrderedDict
 from asar.integrity.base import IntegrityInfo
 from asar.integrity.base import IntegrityDictInfo
 
@@ -41,3 +43,18 @@ def test_to_json(random_meta_info: IntegrityInfo):
     assert meta["hash"] == random_meta_info.hash_
     assert meta["blockSize"] == random_meta_info.blocksize
     assert meta["blocks"] == random_meta_info.blocks
+
+
+def test_from_json_compact():
+    """Test IntegrityInfo.from_json shares objects of small files."""
+    hash_ = os.urandom(32).hex()
+    # Json decoder creates different strings for the same value.
+    block = hash_[:32] + hash_[32:]
+    integrity: IntegrityDictInfo = OrderedDict()
+    integrity["algorithm"] = "SHA256"
+    integrity["hash"] = hash_
+    integrity["blockSize"] = 4194304
+    integrity["blocks"] = [block]
+    meta = IntegrityInfo.from_json(integrity)
+    assert meta.blocks[0] is meta.hash_
+    assert not hasattr(meta, "__dict__")
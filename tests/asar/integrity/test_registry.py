@@ -0,0 +1,13 @@
+"""Test ./src/asar/integrity/registry.py functions."""
+
+import pytest
+from asar.integrity.sha256 import Sha256Checker
+from asar.integrity.registry import get_checker
+
+
+def test_get_checker():
+    """Check if checkers are looked up by algorithm."""
+    assert isinstance(get_checker("SHA256"), Sha256Checker)
+    assert get_checker("SHA256") is get_checker("SHA256")
+    with pytest.raises(KeyError):
+        _ = get_checker("MD5")  # type: ignore
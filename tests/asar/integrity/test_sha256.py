@@ -13,3 +13,18 @@ def test_check():
     sha256 = hashlib.sha256(content).hexdigest()
     integrity = IntegrityInfo("SHA256", sha256, 4096, [sha256])
     assert checker.check(content, integrity)
+
+
+def test_generate():
+    """Test generate function."""
+    checker = Sha256Checker()
+    content = os.urandom(100)
+    chunks = [content[i : i + 30] for i in range(0, len(content), 30)]
+    integrity = checker.generate(chunks, 40)
+    assert integrity.hash_ == hashlib.sha256(content).hexdigest()
+    assert integrity.blocks == [
+        hashlib.sha256(content[:40]).hexdigest(),
+        hashlib.sha256(content[40:80]).hexdigest(),
+        hashlib.sha256(content[80:]).hexdigest(),
+    ]
+    assert checker.check(content, integrity)
@@ -0,0 +1,36 @@
+"""Test ./src/asar/integrity/verifier.py functions."""
+
+import os
+from pathlib import PurePath
+from asar.file.base import AsarFile
+from asar.file.base import FileMetaInfo
+from asar.integrity.sha256 import Sha256Checker
+from asar.integrity.verifier import IntegrityVerifier
+
+
+def _create_file(size: int, blocksize: int) -> AsarFile:
+    content = os.urandom(size)
+    integrity = Sha256Checker().generate([content], blocksize)
+    return AsarFile(FileMetaInfo("0", size, False, integrity), content)
+
+
+def test_verify_valid():
+    """Test IntegrityVerifier.verify function."""
+    files = {PurePath(str(i)): _create_file(i * 10, 16) for i in range(10)}
+    assert IntegrityVerifier(4).verify(files) == []
+
+
+def test_verify_invalid():
+    """Test IntegrityVerifier.verify function."""
+    files = {PurePath(str(i)): _create_file(100, 16) for i in range(3)}
+    for path in [PurePath("0"), PurePath("2")]:
+        content = bytearray(files[path].content)
+        content[20] ^= 0xFF
+        files[path].content = bytes(content)
+    mismatches = IntegrityVerifier(2).verify(files)
+    assert [(m.path, m.block) for m in mismatches] == [
+        (PurePath("0"), None),
+        (PurePath("0"), 1),
+        (PurePath("2"), None),
+        (PurePath("2"), 1),
+    ]
@@ -1,7 +1,17 @@
 """Test ./src/asar/__init__.py functions."""
 
+import os
+import pytest
 from asar import Asar
 from pathlib import Path
+from pathlib import PurePath
+from asar.file.base import AsarFile
+from asar.file.base import DiskAsarFile
+from asar.file.base import FileMetaInfo
+from collections.abc import Iterable
+from asar.integrity.base import IntegrityInfo
+from asar.integrity.base import ChecksumMismatchError
+from asar.integrity.sha256 import Sha256Checker
 
 
 def test___bytes__(asar_path: Path):
@@ -9,3 +19,227 @@ def test___bytes__(asar_path: Path):
     content = asar_path.read_bytes()
     asar = Asar(content)
     assert (bytes(asar)[:16]) == content[:16]
+
+
+def test_open(asar_path: Path):
+    """Test Asar.open function."""
+    content = Asar(asar_path.read_bytes())
+    with Asar.open(asar_path) as asar:
+        assert asar.files == content.files
+        for path, f in asar.items():
+            assert isinstance(f.content, memoryview)
+            assert f.content == content[path].content
+            assert f.check()
+        assert bytes(asar) == bytes(content)
+
+
+def test_close(asar_path: Path):
+    """Test Asar.close function."""
+    asar = Asar.open(asar_path)
+    f = next(iter(asar.values()))
+    asar.close()
+    with pytest.raises(ValueError, match="released"):
+        _ = len(f.content)
+    asar.close()
+
+
+def test_close_exported(asar_path: Path):
+    """Test Asar.close function when content read is still alive."""
+    with Asar.open(asar_path) as asar:
+        path = next(iter(asar))
+        content = asar.read(path, 1, 8)
+        expected = bytes(asar[path].content[1:9])
+    assert content == expected
+
+
+def test_write_integrity(asar_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test Asar.write function."""
+    asar = Asar(asar_path.read_bytes())
+    asar[PurePath("new.bin")] = AsarFile.from_content(os.urandom(42))
+    generated: list[int] = []
+    generate = Sha256Checker.generate
+
+    def _generate(
+        self: Sha256Checker,
+        data: Iterable[bytes | memoryview],
+        blocksize: int,
+    ) -> IntegrityInfo:
+        generated.append(blocksize)
+        return generate(self, data, blocksize)
+
+    monkeypatch.setattr(Sha256Checker, "generate", _generate)
+    raw = bytes(asar)
+    # One for the placeholder, one for the new file.
+    assert len(generated) == 1 + 1
+    saved = Asar(raw)
+    assert all(f.check() for f in saved.values())
+    assert bytes(saved) == raw
+
+
+def test_write_load_ahead(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test Asar.write function loads files ahead within LOAD_AHEAD_SIZE."""
+    load_ahead_size = 100
+    monkeypatch.setattr("asar.LOAD_AHEAD_SIZE", load_ahead_size)
+    asar = Asar()
+    for size in (0, 50, 80, 150, 30):
+        _ = (tmp_path / f"{size}.bin").write_bytes(os.urandom(size))
+        asar[PurePath(f"{size}.bin")] = DiskAsarFile.from_path(tmp_path / f"{size}.bin")
+    raw = bytes(asar)
+    assert not any(f.dirty for f in asar.values())
+    saved = Asar(raw)
+    assert all(f.check() for f in saved.values())
+    for path, f in saved.items():
+        assert f.content == (tmp_path / path).read_bytes()
+
+
+def test_mutation(asar_path: Path):
+    """Test Asar mutation functions keep json header in sync."""
+    asar = Asar(asar_path.read_bytes())
+    new = AsarFile.from_content(os.urandom(42))
+    asar.update({PurePath("a/b/c.bin"): new, PurePath("/a/d.bin"): new})
+    _ = asar.setdefault(PurePath("e.bin"), new)
+    assert asar.setdefault(PurePath("/e.bin"), AsarFile.from_content(b"")) is new
+    assert list(asar.json_header["files"]) == ["a", "e.bin", "test.bin"]
+    del asar[PurePath("/a/b/c.bin")]
+    assert asar.pop(PurePath("a/d.bin")) is new
+    assert asar.pop(PurePath("a/d.bin"), None) is None
+    assert list(asar.json_header["files"]) == ["e.bin", "test.bin"]
+    asar.clear()
+    assert asar.json_header == {"files": {}}
+
+
+def test_iter_files(asar_path: Path):
+    """Test Asar.iter_files and Asar.iter_folders function."""
+    asar = Asar(asar_path.read_bytes())
+    asar[PurePath("a/b.bin")] = AsarFile.from_content(b"")
+    assert list(asar.iter_files()) == asar.files == sorted(asar.keys())
+    assert list(asar.iter_folders()) == asar.folders == [PurePath("a")]
+
+
+def test_unpacked(tmp_path: Path):
+    """Test unpacked files are resolved lazily."""
+    asar = Asar()
+    asar[PurePath("addon.node")] = AsarFile.from_content(os.urandom(42))
+    asar[PurePath("addon.node")].meta.offset = None
+    with (tmp_path / "test.asar").open("wb") as f:
+        asar.write(f, tmp_path / "test.asar.unpacked")
+    raw = (tmp_path / "test.asar").read_bytes()
+    lazy = Asar(raw)
+    with pytest.raises(RuntimeError):
+        _ = lazy[PurePath("addon.node")].content
+    with Asar.open(tmp_path / "test.asar") as opened:
+        assert opened[PurePath("addon.node")].content == asar[PurePath("addon.node")].content
+        assert opened[PurePath("addon.node")].check()
+
+
+def test_read(monkeypatch: pytest.MonkeyPatch):
+    """Test ranged read verifies overlapping blocks only once."""
+    blocksize = 16
+    content = os.urandom(blocksize * 4)
+    integrity = Sha256Checker().generate([content], blocksize)
+    asar = Asar()
+    meta = FileMetaInfo("0", len(content), False, integrity)
+    asar[PurePath("test.bin")] = AsarFile(meta, content)
+    hashed: list[int] = []
+    hexdigest = Sha256Checker.hexdigest
+
+    def _hexdigest(self: Sha256Checker, data: bytes | memoryview) -> str:
+        hashed.append(len(data))
+        return hexdigest(self, data)
+
+    monkeypatch.setattr(Sha256Checker, "hexdigest", _hexdigest)
+    assert asar.read(PurePath("/test.bin"), blocksize + 1, blocksize) == content[17:33]
+    assert hashed == [blocksize, blocksize]
+    assert asar.read(PurePath("test.bin"), blocksize + 2, 4) == content[18:22]
+    assert hashed == [blocksize, blocksize]
+    corrupted = bytearray(content)
+    corrupted[-1] ^= 1
+    asar[PurePath("test.bin")] = AsarFile(
+        FileMetaInfo("0", len(content), False, integrity),
+        bytes(corrupted),
+    )
+    assert asar.read(PurePath("test.bin"), 0, blocksize) == content[:blocksize]
+    with pytest.raises(ChecksumMismatchError, match="Integrity mismatch"):
+        _ = asar.read(PurePath("test.bin"), blocksize * 3)
+    assert asar.read(PurePath("test.bin"), blocksize * 3, verify=False) == corrupted[48:]
+
+
+def test_read_replaced():
+    """Test replacing a file sharing integrity with the old one verifies it again."""
+    content = os.urandom(42)
+    asar = Asar()
+    asar[PurePath("test.bin")] = AsarFile.from_content(content)
+    asar[PurePath("test.bin")].sync_meta()
+    meta = asar[PurePath("test.bin")].meta
+    assert asar.read(PurePath("test.bin")) == content
+    corrupted = bytes(reversed(content))
+    asar[PurePath("test.bin")] = AsarFile(meta, corrupted)
+    with pytest.raises(ChecksumMismatchError, match="Integrity mismatch"):
+        _ = asar.read(PurePath("test.bin"))
+    _ = asar.pop(PurePath("test.bin"))
+    _ = asar.setdefault(PurePath("test.bin"), AsarFile(meta, content))
+    assert asar.read(PurePath("test.bin")) == content
+    del asar[PurePath("test.bin")]
+    asar.update({PurePath("test.bin"): AsarFile(meta, corrupted)})
+    with pytest.raises(ChecksumMismatchError, match="Integrity mismatch"):
+        _ = asar.read(PurePath("test.bin"))
+
+
+def test_lazy():
+    """Test lazy archives create files of a folder only when it is accessed."""
+    content = Asar()
+    for path in ("a/b/1.js", "a/2.js", "c/3.js", "package.json"):
+        content[PurePath(path)] = AsarFile.from_content(os.urandom(42))
+    raw = bytes(content)
+    asar = Asar(raw, lazy=True)
+    # Keys of dict itself are only the files created so far.
+    created = dict[PurePath, AsarFile].keys
+    assert len(created(asar)) == 0
+    assert asar[PurePath("/a/2.js")].content == content[PurePath("a/2.js")].content
+    assert sorted(created(asar)) == [PurePath("a/2.js"), PurePath("package.json")]
+    assert PurePath("a/b/1.js") in asar
+    assert PurePath("c/4.js") not in asar
+    assert asar.files == content.files
+    assert bytes(asar) == raw
+
+
+def test_lazy_dict(tmp_path: Path):
+    """Test dict methods of lazy archives see all files."""
+    content = Asar()
+    for path in ("a/b/1.js", "a/2.js", "package.json"):
+        content[PurePath(path)] = AsarFile.from_content(os.urandom(42))
+    raw = bytes(content)
+    eager = Asar(raw)
+    count = len(eager)
+    assert Asar(raw, lazy=True) == eager
+    assert eager == Asar(raw, lazy=True)
+    assert not Asar(raw, lazy=True) != eager  # noqa: SIM202
+    assert all(repr(path) in repr(Asar(raw, lazy=True)) for path in eager)
+    assert len(Asar(raw, lazy=True).copy()) == count
+    empty: dict[PurePath, AsarFile] = {}
+    assert len(Asar(raw, lazy=True) | empty) == count
+    assert len(empty | Asar(raw, lazy=True)) == count
+    assert len(list(reversed(Asar(raw, lazy=True)))) == count
+    assert len(dict(Asar(raw, lazy=True))) == count
+    _ = (tmp_path / "test.asar").write_bytes(raw)
+    asar = Asar.open(tmp_path / "test.asar", lazy=True)
+    asar.close()
+    assert asar.files == eager.files
+    with pytest.raises(ValueError, match="released"):
+        _ = len(asar[PurePath("a/b/1.js")].content)
+
+
+def test_to_bytes_dedupe():
+    """Test Asar.to_bytes function with dedupe."""
+    content = os.urandom(42)
+    asar = Asar()
+    for path in ("a/LICENSE", "b/LICENSE", "c/LICENSE"):
+        asar[PurePath(path)] = AsarFile.from_content(content)
+    asar[PurePath("main.js")] = AsarFile.from_content(os.urandom(42))
+    raw = asar.to_bytes(dedupe=True)
+    assert len(raw) < len(bytes(asar)) - len(content)
+    deduped = Asar(raw)
+    assert deduped[PurePath("a/LICENSE")].meta.offset == deduped[PurePath("c/LICENSE")].meta.offset
+    for path, f in deduped.items():
+        assert f.content == asar[path].content
+        assert f.check()
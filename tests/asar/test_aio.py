@@ -0,0 +1,81 @@
+"""Test ./src/asar/aio.py functions."""
+
+import os
+import sys
+import pytest
+import asyncio
+from asar import Asar
+from pathlib import Path
+from pathlib import PurePath
+from asar.aio import AsyncAsar
+from asar.file.base import AsarFile
+from asar.integrity.base import ChecksumMismatchError
+
+
+def _create(path: Path) -> Asar:
+    asar = Asar()
+    asar[PurePath("dir/test.bin")] = AsarFile.from_content(os.urandom(42))
+    asar[PurePath("run.sh")] = AsarFile.from_content(os.urandom(42), executable=True)
+    _ = path.write_bytes(bytes(asar))
+    return asar
+
+
+def test_read(tmp_path: Path):
+    """Test AsyncAsar.read function."""
+    content = _create(tmp_path / "test.asar")
+
+    async def _main() -> bytes:
+        async with await AsyncAsar.open(tmp_path / "test.asar") as asar:
+            return await asar.read(PurePath("dir/test.bin"), 2, 8)
+
+    assert asyncio.run(_main()) == content[PurePath("dir/test.bin")].content[2:10]
+
+
+def test_read_lazy(tmp_path: Path):
+    """Test AsyncAsar.read function from many tasks on a lazy archive."""
+    content = Asar()
+    for i in range(3000):
+        content[PurePath(f"{i % 3}/{i}.bin")] = AsarFile.from_content(os.urandom(8))
+    _ = (tmp_path / "test.asar").write_bytes(bytes(content))
+    paths = list(content)[::20]
+
+    async def _main() -> list[bytes]:
+        async with await AsyncAsar.open(tmp_path / "test.asar", lazy=True) as asar:
+            return await asyncio.gather(*(asar.read(path) for path in paths))
+
+    # Threads switch often, so they access folders being created by other threads.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for _ in range(5):
+            assert asyncio.run(_main()) == [content[path].content for path in paths]
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def test_extract(tmp_path: Path):
+    """Test AsyncAsar.extract function."""
+    content = _create(tmp_path / "test.asar")
+
+    async def _main():
+        async with await AsyncAsar.open(tmp_path / "test.asar", lazy=True) as asar:
+            await asar.extract(tmp_path / "dest")
+
+    asyncio.run(_main())
+    for path, f in content.items():
+        assert (tmp_path / "dest" / path).read_bytes() == f.content
+    assert os.access(tmp_path / "dest" / "run.sh", os.X_OK)
+
+
+def test_extract_invalid(tmp_path: Path):
+    """Test AsyncAsar.extract function with an invalid file."""
+    _ = _create(tmp_path / "test.asar")
+    raw = bytearray((tmp_path / "test.asar").read_bytes())
+    raw[-1] ^= 1
+
+    async def _main():
+        async with AsyncAsar(Asar(bytes(raw))) as asar:
+            await asar.extract(tmp_path / "dest")
+
+    with pytest.raises(ChecksumMismatchError, match="Integrity mismatch"):
+        asyncio.run(_main())
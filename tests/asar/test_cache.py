@@ -0,0 +1,64 @@
+"""Test ./src/asar/cache.py functions."""
+
+import os
+import pytest
+from asar import Asar
+from typing import cast
+from pathlib import Path
+from asar.cache import HeaderCache
+from asar.header import AsarHeader
+from asar.file.base import AsarFile
+from asar.file.base import FolderMetaDictInfo
+
+
+def test_header_cache(tmp_path: Path):
+    """Test AsarHeader.read with HeaderCache."""
+    archive = tmp_path / "test.asar"
+    asar = Asar()
+    asar[Path("test.bin")] = AsarFile.from_content(os.urandom(42))
+    _ = archive.write_bytes(bytes(asar))
+    cache = HeaderCache(tmp_path / "cache")
+    with archive.open("rb") as f:
+        header = AsarHeader.read(f, cache=cache)
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+    with archive.open("rb") as f:
+        cached = AsarHeader.read(f, cache=cache)
+    assert cached.json == header.json
+    assert cached.offset == header.offset
+    with Asar.open(archive, cache=cache) as opened:
+        assert opened[Path("test.bin")].check()
+    cache.clear()
+    assert len(list((tmp_path / "cache").iterdir())) == 0
+
+
+def test_header_cache_evict(tmp_path: Path):
+    """Test HeaderCache removes least recently used entries."""
+    cache = HeaderCache(tmp_path, max_size=1024)
+    data = cast(FolderMetaDictInfo, {"files": {"x" * 400: {"size": 0}}})
+    for key in ("a", "b", "c"):
+        cache.put(key, data)
+        os.utime(tmp_path / key, ns=(ord(key), ord(key)))
+    assert sorted(os.listdir(tmp_path)) == ["b", "c"]
+    assert cache.get("b") == data
+
+
+def test_header_cache_put_failed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test HeaderCache.put leaves no temporary file behind when writing fails."""
+    cache = HeaderCache(tmp_path)
+    data = cast(FolderMetaDictInfo, {"files": {}})
+
+    def _replace(_: Path, target: Path) -> Path:
+        raise PermissionError(target)
+
+    monkeypatch.setattr(Path, "replace", _replace)
+    cache.put("a", data)
+    assert os.listdir(tmp_path) == []
+    monkeypatch.undo()
+
+    def _dump(value: object, _: object):
+        raise TypeError(value)
+
+    monkeypatch.setattr("asar.cache.marshal.dump", _dump)
+    with pytest.raises(TypeError):
+        cache.put("a", data)
+    assert os.listdir(tmp_path) == []
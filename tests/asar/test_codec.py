@@ -0,0 +1,37 @@
+"""Test ./src/asar/codec.py functions."""
+
+import pytest
+from asar.codec import CODECS
+from asar.codec import CodecType
+from asar.codec import compress
+from asar.codec import decompress
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_codec(codec: CodecType):
+    """Test compress and decompress functions."""
+    chunks = [b"console.log(1);\n" * 100, b"", b"console.log(2);\n" * 100]
+    compressed = b"".join(compress(chunks, codec))
+    assert len(compressed) < len(b"".join(chunks))
+    halves = [compressed[: len(compressed) // 2], compressed[len(compressed) // 2 :]]
+    assert b"".join(decompress(halves, codec)) == b"".join(chunks)
+    with pytest.raises(ValueError, match="truncated"):
+        _ = b"".join(decompress(halves[:1], codec))
+    with pytest.raises(ValueError, match="Invalid"):
+        _ = b"".join(decompress([b"invalid content"], codec))
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_decompress_bounded(codec: CodecType, monkeypatch: pytest.MonkeyPatch):
+    """Test decompress function bounds output and checks size."""
+    max_output_size = 1000
+    monkeypatch.setattr("asar.codec.MAX_OUTPUT_SIZE", max_output_size)
+    content = b"\0" * (max_output_size * 10 + 1)
+    compressed = b"".join(compress([content], codec))
+    chunks = list(decompress([compressed], codec, len(content)))
+    assert all(len(chunk) <= max_output_size for chunk in chunks)
+    assert b"".join(chunks) == content
+    with pytest.raises(ValueError, match="larger"):
+        _ = b"".join(decompress([compressed], codec, len(content) - 1))
+    with pytest.raises(ValueError, match="smaller"):
+        _ = b"".join(decompress([compressed], codec, len(content) + 1))
@@ -0,0 +1,78 @@
+"""Test ./src/asar/fs.py functions."""
+
+import os
+import pytest
+from asar import Asar
+from asar.fs import AsarFS
+from asar.fs import ContentCache
+from pathlib import Path
+from pathlib import PurePath
+from asar.file.base import AsarFile
+from asar.integrity.base import ChecksumMismatchError
+
+
+def _create(path: Path) -> Asar:
+    asar = Asar()
+    asar[PurePath("lib/index.js")] = AsarFile.from_content(b"module.exports = 42;")
+    asar[PurePath("lib/util/a.js")] = AsarFile.from_content(os.urandom(42))
+    asar[PurePath("run.sh")] = AsarFile.from_content(os.urandom(42), executable=True)
+    _ = path.write_bytes(bytes(asar))
+    return asar
+
+
+def test_fs(tmp_path: Path):
+    """Test AsarFS functions."""
+    content = _create(tmp_path / "test.asar")
+    with AsarFS.from_path(tmp_path / "test.asar") as fs:
+        assert fs.exists(PurePath("/lib/util"))
+        assert fs.is_dir(PurePath("lib"))
+        assert fs.is_file(PurePath("run.sh"))
+        assert not fs.exists(PurePath("lib/missing.js"))
+        assert fs.listdir() == ["lib", "run.sh"]
+        assert fs.listdir(PurePath("lib")) == ["index.js", "util"]
+        assert list(fs.walk()) == [
+            (PurePath(), ["lib"], ["run.sh"]),
+            (PurePath("lib"), ["util"], ["index.js"]),
+            (PurePath("lib/util"), [], ["a.js"]),
+        ]
+        stat = fs.stat(PurePath("run.sh"))
+        assert stat.executable
+        assert not stat.is_dir
+        assert fs.stat(PurePath("lib")).is_dir
+        assert fs.read_text(PurePath("lib/index.js")) == "module.exports = 42;"
+        with fs.open(PurePath("run.sh")) as f:
+            assert f.read() == content[PurePath("run.sh")].content
+        with pytest.raises(FileNotFoundError):
+            _ = fs.stat(PurePath("missing"))
+        with pytest.raises(NotADirectoryError):
+            _ = fs.listdir(PurePath("run.sh"))
+        with pytest.raises(IsADirectoryError):
+            _ = fs.read_bytes(PurePath("lib"))
+
+
+def test_fs_invalid(tmp_path: Path):
+    """Test reading a corrupted file raises ChecksumMismatchError."""
+    _ = _create(tmp_path / "test.asar")
+    raw = bytearray((tmp_path / "test.asar").read_bytes())
+    raw[-1] ^= 1
+    with AsarFS(Asar(bytes(raw))) as fs, pytest.raises(ChecksumMismatchError):
+        _ = fs.read_bytes(PurePath("run.sh"))
+
+
+def test_cache(tmp_path: Path):
+    """Test contents are cached and shared by many archives."""
+    max_size = 64
+    cache = ContentCache(max_size)
+    content = _create(tmp_path / "a.asar")
+    _ = _create(tmp_path / "b.asar")
+    with (
+        AsarFS.from_path(tmp_path / "a.asar", cache=cache) as a,
+        AsarFS.from_path(tmp_path / "b.asar", cache=cache) as b,
+    ):
+        first = a.read_bytes(PurePath("lib/util/a.js"))
+        assert a.read_bytes(PurePath("lib/util/a.js")) is first
+        assert b.read_bytes(PurePath("lib/util/a.js")) != first
+        assert len(cache) == 1
+        assert cache.size <= max_size
+    # Cached contents are still valid after archives are closed.
+    assert first == content[PurePath("lib/util/a.js")].content
@@ -0,0 +1,51 @@
+"""Test ./src/asar/header.py functions."""
+
+import json
+import pytest
+from asar import Asar
+from pathlib import Path
+from pathlib import PurePath
+from asar.header import AsarHeader
+
+
+def test_read(asar_path: Path):
+    """Test AsarHeader.read function."""
+    content = asar_path.read_bytes()
+    with asar_path.open("rb") as f:
+        header = AsarHeader.read(f)
+        assert header.json == AsarHeader.parse(content).json
+        meta = header.get(PurePath("/test.bin"))
+        assert header.read_content(f, meta) == Asar(content)[PurePath("test.bin")].content
+
+
+def test_get_missing(asar_path: Path):
+    """Test AsarHeader.get function."""
+    with asar_path.open("rb") as f:
+        header = AsarHeader.read(f)
+    with pytest.raises(KeyError):
+        _ = header.get(PurePath("missing.bin"))
+    with pytest.raises(KeyError):
+        _ = header.get(PurePath("test.bin/missing.bin"))
+
+
+def test_parse_invalid():
+    """Test AsarHeader.parse function."""
+    with pytest.raises(ValueError, match="magic"):
+        _ = AsarHeader.parse(bytes(16))
+
+
+def test_parse_orjson(asar_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """Test AsarHeader.parse function parses with orjson if it is installed."""
+    content = asar_path.read_bytes()
+    expected = Asar(content).json_header
+    calls: list[bytes] = []
+
+    class _Orjson:
+        @staticmethod
+        def loads(data: bytes) -> object:
+            calls.append(data)
+            return json.loads(data)
+
+    monkeypatch.setattr("asar.header.orjson", _Orjson)
+    assert AsarHeader.parse(content).json == expected
+    assert len(calls) == 1
@@ -0,0 +1,21 @@
+"""Test ./src/asar/ordering.py functions."""
+
+from pathlib import PurePath
+from asar.ordering import parse_ordering
+from asar.ordering import ordering_from_trace
+
+
+def test_parse_ordering():
+    """Test parse_ordering function."""
+    lines = ["/main.js", "", "1: lib/index.js", "# comment"]
+    assert parse_ordering(lines) == [PurePath("main.js"), PurePath("lib/index.js")]
+
+
+def test_ordering_from_trace():
+    """Test ordering_from_trace function."""
+    lines = ["main.js", "lib/a.js", "main.js", "/lib/b.js", "lib/a.js"]
+    assert ordering_from_trace(lines) == [
+        PurePath("main.js"),
+        PurePath("lib/a.js"),
+        PurePath("lib/b.js"),
+    ]
@@ -0,0 +1,57 @@
+"""Test ./src/asar/tree.py functions."""
+
+import pytest
+from pathlib import PurePath
+from asar.tree import FileTree
+
+
+def test_walk():
+    """Test FileTree.walk function."""
+    tree: FileTree[int] = FileTree()
+    tree.add(PurePath("a-b"), 1)
+    tree.add(PurePath("a/b/c"), 2)
+    tree.add(PurePath("a/d"), 3)
+    assert list(tree.walk()) == [
+        (PurePath("a"), None),
+        (PurePath("a/b"), None),
+        (PurePath("a/b/c"), 2),
+        (PurePath("a/d"), 3),
+        (PurePath("a-b"), 1),
+    ]
+
+
+def test_add_conflict():
+    """Test FileTree.add function."""
+    tree: FileTree[int] = FileTree()
+    tree.add(PurePath("a/b"), 1)
+    with pytest.raises(ValueError, match="file"):
+        tree.add(PurePath("a/b/c"), 2)
+    with pytest.raises(ValueError, match="folder"):
+        tree.add(PurePath("a"), 2)
+
+
+def test_remove():
+    """Test FileTree.remove function."""
+    tree: FileTree[int] = FileTree()
+    tree.add(PurePath("a/b/c"), 1)
+    tree.add(PurePath("d"), 2)
+    with pytest.raises(KeyError):
+        tree.remove(PurePath("a/b"))
+    tree.remove(PurePath("a/b/c"))
+    assert list(tree.walk()) == [(PurePath("d"), 2)]
+    with pytest.raises(KeyError):
+        tree.remove(PurePath("a/b/c"))
+
+
+def test_index():
+    """Test FileTree.files and FileTree.folders function."""
+    tree: FileTree[int] = FileTree()
+    tree.add(PurePath("a/b"), 1)
+    files = tree.files
+    assert files == [PurePath("a/b")]
+    assert tree.files is files
+    assert tree.folders == [PurePath("a")]
+    tree.add(PurePath("a/b"), 2)
+    assert tree.values == [2]
+    tree.add(PurePath("c"), 3)
+    assert tree.files == [PurePath("a/b"), PurePath("c")]